@@ -13,6 +13,7 @@ __description__ = "CKA PDF Question and Image Extractor"
 from .models import (
     QuestionAnswer,
     StructuredQuestionAnswer, 
+    ImagePayload,
     ExtractionStats,
     PDFExtractionError,
     ImageExtractionError,
@@ -42,6 +43,7 @@ __all__ = [
     # 모델들
     'QuestionAnswer',
     'StructuredQuestionAnswer',
+    'ImagePayload',
     'ExtractionStats',
     'PDFExtractionError',
     'ImageExtractionError', 
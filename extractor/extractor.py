@@ -5,7 +5,11 @@ CKA PDF 추출기 - 핵심 추출 기능 (텍스트 순서 기반 이미지 매
 import os
 import re
 import time
-from typing import List, Dict, Tuple, Optional
+import bisect
+import heapq
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, Sequence, Iterator
 from models import (
     QuestionAnswer, StructuredQuestionAnswer, ImageInfo, TextBlock, 
     ContentElement, ContentType, ExtractionStats,
@@ -36,237 +40,472 @@ try:
 except ImportError:
     HAS_PYMUPDF = False
 
+try:
+    import pypdfium2
+    HAS_PYPDFIUM2 = True
+except ImportError:
+    HAS_PYPDFIUM2 = False
+
+# 문제/답변 마커 패턴 (모듈 로드 시 한 번만 컴파일)
+_RE_QUESTION_NO = re.compile(r'QUESTION NO:\s*(\d+)', re.IGNORECASE)
+_RE_ANSWER = re.compile(r'Answer:\s*', re.IGNORECASE)
+
+# Windows에서 os.open으로 쓸 때 줄바꿈 변환 방지
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+# 이미지가 없는 영역에 공통으로 돌려주는 빈 결과 (불변이라 공유해도 안전)
+_NO_IMAGES = ()
+
+# 페이지 경계에 걸친 마커를 다시 찾을 때 경계 앞뒤로 살펴보는 글자 수
+_SEAM_WINDOW = 200
+
+def _iter_page_matches(pages: List[Dict[str, any]], pattern) -> Iterator[Tuple[int, int, 're.Match']]:
+    """페이지별 텍스트에서 pattern을 찾아 (전체 텍스트 기준 시작, 끝, match)를 위치순으로 생성
+    
+    페이지 경계(줄바꿈 한 글자)에 걸친 마커(예: 'QUESTION NO:' 뒤 번호가 다음 페이지에 있는 경우)는
+    경계 앞뒤 _SEAM_WINDOW 글자 창에서 다시 찾아, 이어 붙인 전체 텍스트를 검색한 결과와 같게 맞춘다.
+    창보다 긴 마커는 찾지 못한다.
+    """
+    skip_until = 0  # 앞 페이지 경계 마커가 덮은 구간의 끝
+    for i, page in enumerate(pages):
+        page_text = page['text']
+        offset = page['offset']
+        
+        # 다음 페이지와의 경계에 걸친 마커 (겹치지 않는 검색이므로 경계 하나에 최대 하나)
+        # 전체 텍스트는 마지막 페이지 뒤에도 줄바꿈이 붙으므로 마지막 페이지도 같은 방식으로 확인
+        seam_match = None
+        tail_start = max(len(page_text) - _SEAM_WINDOW, 0)
+        tail_len = len(page_text) - tail_start
+        # 다음 페이지가 비어 있거나 짧으면 공백이 그 뒤 경계까지 이어질 수 있으므로 창 크기만큼 여러 페이지를 이어 붙임
+        # (목록을 복사하지 않고 인덱스로 순회하며, 페이지마다 남은 창 크기만큼만 잘라 붙임)
+        next_head = ""
+        for j in range(i + 1, len(pages)):
+            if len(next_head) >= _SEAM_WINDOW:
+                break
+            next_head += pages[j]['text'][:_SEAM_WINDOW - len(next_head)] + "\n"
+        for match in pattern.finditer(page_text[tail_start:] + "\n" + next_head[:_SEAM_WINDOW]):
+            if match.start() < tail_len < match.end() and offset + tail_start + match.start() >= skip_until:
+                seam_match = match
+                break
+        
+        for match in pattern.finditer(page_text):
+            if seam_match is not None and match.start() >= tail_start + seam_match.start():
+                break  # 페이지 끝에서 잘린 마커는 경계 마커로 대체
+            start = offset + match.start()
+            if start >= skip_until:
+                yield start, offset + match.end(), match
+        
+        if seam_match is not None:
+            start = offset + tail_start + seam_match.start()
+            skip_until = offset + tail_start + seam_match.end()
+            yield start, skip_until, seam_match
+
+def _searchsorted(positions: Sequence[int], values: Sequence[float]) -> List[int]:
+    """정렬된 positions에서 각 value의 bisect_left 인덱스를 한 번의 병합 순회로 계산"""
+    indices = [0] * len(values)
+    i = 0
+    for k in sorted(range(len(values)), key=values.__getitem__):
+        value = values[k]
+        while i < len(positions) and positions[i] < value:
+            i += 1
+        indices[k] = i
+    return indices
+
 class PDFExtractor:
     """PDF에서 텍스트와 이미지를 추출하는 클래스"""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, image_dir: str = "extracted_images"):
         self.pdf_path = pdf_path
-        self.image_dir = create_output_directory("extracted_images")
+        self.image_dir = create_output_directory(image_dir)
         
-    def extract_text_simple(self) -> str:
-        """간단한 텍스트 추출 (위치 정보 없음)"""
-        if HAS_PDFPLUMBER:
+    def extract_text_simple(self, doc=None) -> str:
+        """간단한 텍스트 추출 (위치 정보 없음, 열린 doc이 있으면 재사용)"""
+        # PyMuPDF(C 기반)가 가장 빠르므로 기본으로 사용하고, 나머지는 미설치/실패 시 대체용
+        if HAS_PYMUPDF:
+            try:
+                return self._extract_with_pymupdf(doc)
+            except PDFExtractionError as e:
+                if not (HAS_PYPDFIUM2 or HAS_PDFPLUMBER or HAS_PYPDF2):
+                    raise
+                print(f"{e} - 대체 라이브러리로 다시 시도합니다")
+        if HAS_PYPDFIUM2:
+            # PDFium(C++) 텍스트 레이어를 직접 사용하므로 pdfplumber/PyPDF2보다 빠름
+            return self._extract_with_pypdfium2()
+        elif HAS_PDFPLUMBER:
             return self._extract_with_pdfplumber()
-        elif HAS_PYMUPDF:
-            return self._extract_with_pymupdf()
         elif HAS_PYPDF2:
             return self._extract_with_pypdf2()
         else:
             raise PDFExtractionError("PDF 처리 라이브러리가 설치되지 않았습니다.")
     
+    def _extract_with_pypdfium2(self) -> str:
+        """pypdfium2를 사용한 텍스트 추출"""
+        parts = []
+        try:
+            pdf = pypdfium2.PdfDocument(self.pdf_path)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium은 줄바꿈을 \r\n으로 돌려주므로 다른 추출기와 맞춤
+                    page_text = textpage.get_text_range().replace("\r\n", "\n")
+                    textpage.close()
+                    page.close()
+                    if page_text:
+                        parts.append(page_text)
+                        parts.append("\n")
+            finally:
+                pdf.close()
+        except Exception as e:
+            raise PDFExtractionError(f"pypdfium2 텍스트 추출 실패: {e}")
+        return "".join(parts)
+    
     def _extract_with_pdfplumber(self) -> str:
         """pdfplumber를 사용한 텍스트 추출"""
-        text = ""
+        parts = []
         try:
             with pdfplumber.open(self.pdf_path) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
+                        parts.append(page_text)
+                        parts.append("\n")
         except Exception as e:
             raise PDFExtractionError(f"pdfplumber 텍스트 추출 실패: {e}")
-        return text
+        return "".join(parts)
     
-    def _extract_with_pymupdf(self) -> str:
-        """PyMuPDF를 사용한 텍스트 추출"""
-        text = ""
+    def _extract_with_pymupdf(self, doc=None) -> str:
+        """PyMuPDF를 사용한 텍스트 추출 (doc이 주어지면 다시 열지 않음)"""
+        parts = []
+        owns_doc = doc is None
         try:
-            doc = fitz.open(self.pdf_path)
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
+            if owns_doc:
+                doc = fitz.open(self.pdf_path)
+            for page in doc:
                 page_text = page.get_text()
                 if page_text:
-                    text += page_text + "\n"
-            doc.close()
+                    parts.append(page_text)
+                    parts.append("\n")
+            if owns_doc:
+                doc.close()
         except Exception as e:
             raise PDFExtractionError(f"PyMuPDF 텍스트 추출 실패: {e}")
-        return text
+        return "".join(parts)
     
     def _extract_with_pypdf2(self) -> str:
         """PyPDF2를 사용한 텍스트 추출"""
-        text = ""
+        parts = []
         try:
             with open(self.pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 for page in pdf_reader.pages:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
+                        parts.append(page_text)
+                        parts.append("\n")
         except Exception as e:
             raise PDFExtractionError(f"PyPDF2 텍스트 추출 실패: {e}")
-        return text
+        return "".join(parts)
+
+class ImageExporter:
+    """xref 단위로 PNG 데이터를 캐시하면서 PDF 이미지를 파일로 저장하는 클래스"""
+    
+    def __init__(self, doc, image_dir: str):
+        self.doc = doc
+        self.image_dir = image_dir
+        self._png_cache = {}  # {xref: PNG bytes}
+        self._executor = None  # 파일 쓰기용 스레드 풀 (처음 저장할 때 생성)
+    
+    def get_png_bytes(self, xref: int) -> bytes:
+        """xref 이미지를 PNG 데이터로 변환 (같은 xref는 한 번만 디코딩)"""
+        data = self._png_cache.get(xref)
+        if data is None:
+            pix = fitz.Pixmap(self.doc, xref)
+            
+            # CMYK 등 4채널 이상 색공간은 RGB로 변환
+            if pix.colorspace and pix.colorspace.n >= 4:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            
+            data = pix.tobytes("png")
+            self._png_cache[xref] = data
+        return data
+    
+    def save_many(self, items: List[Tuple[int, str]]) -> List[str]:
+        """(xref, 파일명) 목록을 저장하고 성공한 파일명을 입력 순서대로 반환
+        
+        PNG 변환은 호출 스레드에서 순서대로 수행하고 (MuPDF 문서 핸들은 스레드 안전하지 않음)
+        디스크 쓰기만 스레드 풀에서 병렬로 처리한다.
+        """
+        if not items:
+            return []
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        
+        futures = []
+        for xref, filename in items:
+            try:
+                data = self.get_png_bytes(xref)
+            except Exception as e:
+                print(f"이미지 저장 실패 ({filename}): {e}")
+                continue
+            futures.append((filename, self._executor.submit(self._write_file, filename, data)))
+        
+        saved_files = []
+        for filename, future in futures:
+            try:
+                future.result()
+                saved_files.append(filename)
+            except Exception as e:
+                print(f"이미지 저장 실패 ({filename}): {e}")
+        
+        return saved_files
+    
+    def _write_file(self, filename: str, data: bytes):
+        """PNG 데이터를 image_dir/filename 에 기록 (버퍼링 없이 한 번의 write 호출)"""
+        fd = os.open(os.path.join(self.image_dir, filename), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
+    def close(self):
+        """쓰기 스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
 class TextBasedImageMapper:
     """텍스트 순서 기반 이미지 매핑 클래스"""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, image_dir: str = "extracted_images"):
         self.pdf_path = pdf_path
-        self.extractor = PDFExtractor(pdf_path)
+        self.extractor = PDFExtractor(pdf_path, image_dir)
         self.image_dir = self.extractor.image_dir
+        # 모든 단계에서 공유하는 PyMuPDF 문서 (한 번만 열고 close()에서 닫음)
+        self._doc = fitz.open(pdf_path) if HAS_PYMUPDF else None
+        self._image_exporter = ImageExporter(self._doc, self.image_dir) if self._doc is not None else None
+    
+    def close(self):
+        """열어둔 PDF 문서 닫기"""
+        if self._image_exporter is not None:
+            self._image_exporter.close()
+            self._image_exporter = None
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def extract_qa_pairs_with_text_mapping(self) -> List[QuestionAnswer]:
         """텍스트 순서를 기반으로 이미지를 매핑한 질문-답변 쌍 추출"""
+        if self._doc is None:
+            raise PDFExtractionError("이미지 위치 분석을 위해서는 PyMuPDF가 필요합니다.")
+        
         try:
-            print("1단계: PDF 텍스트 추출 중...")
-            full_text = self.extractor.extract_text_simple()
+            print("1단계: PDF 스캔 중 (텍스트, 이미지 목록, 위치)...")
+            pages = self._scan_document()
             
             print("2단계: 텍스트 마커 분석 중...")
-            text_markers = self._analyze_text_markers(full_text)
+            text_markers = self._analyze_text_markers(pages)
             
             print("3단계: 페이지별 이미지 위치 분석 중...")
-            page_images = self._extract_images_with_positions()
+            images = self._extract_images_with_positions(pages)
             
             print("4단계: 텍스트 순서 기반 이미지 매핑 중...")
-            qa_pairs = self._map_images_by_text_order(text_markers, page_images, full_text)
+            qa_pairs = self._map_images_by_text_order(text_markers, images, pages)
             
             return qa_pairs
             
         except Exception as e:
             raise PDFExtractionError(f"텍스트 기반 이미지 매핑 실패: {e}")
     
-    def _analyze_text_markers(self, full_text: str) -> List[Dict[str, any]]:
-        """텍스트에서 QUESTION NO:와 Answer: 마커들의 위치 분석"""
-        markers = []
+    def _scan_document(self) -> List[Dict[str, any]]:
+        """문서를 한 번만 순회하며 페이지별 텍스트, 이미지 목록, 이미지 배치(bbox) 수집
+        
+        각 페이지의 'offset'은 페이지 텍스트를 줄바꿈으로 이어 붙인 전체 텍스트에서의
+        시작 위치이며, 전체 텍스트 자체는 만들지 않는다.
+        """
+        pages = []
+        offset = 0
+        
+        for page_num, page in enumerate(self._doc):
+            # 이미지는 xref만 보관 (get_images 튜플의 나머지 필드는 사용하지 않음)
+            image_xrefs = [img[0] for img in page.get_images(full=True)]
+            
+            # 페이지의 모든 이미지 배치를 한 번에 조회 (xref별 첫 번째 bbox 사용)
+            image_bboxes = {}
+            if image_xrefs:
+                try:
+                    for info in page.get_image_info(xrefs=True):
+                        image_bboxes.setdefault(info['xref'], info['bbox'])
+                except Exception as e:
+                    print(f"페이지 {page_num+1} 이미지 위치 분석 실패: {e}")
+                    image_bboxes = None
+            
+            page_text = page.get_text()
+            pages.append({
+                'page_num': page_num,
+                'text': page_text,
+                'offset': offset,
+                'image_xrefs': image_xrefs,
+                'image_bboxes': image_bboxes,
+                'height': page.rect.height
+            })
+            offset += len(page_text) + 1  # +1 for page break
         
+        return pages
+    
+    def _analyze_text_markers(self, pages: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """페이지별 텍스트에서 QUESTION NO:와 Answer: 마커들의 위치 분석 (위치는 전체 텍스트 기준)"""
         # QUESTION NO: 패턴 찾기
-        question_pattern = r'QUESTION NO:\s*(\d+)'
-        for match in re.finditer(question_pattern, full_text, re.IGNORECASE):
-            markers.append({
-                'type': 'question',
-                'number': int(match.group(1)),
-                'position': match.start(),
-                'text': match.group(0)
-            })
+        question_markers = ({
+            'type': 'question',
+            'number': int(match.group(1)),
+            'position': start,
+            'end': end,
+            'text': match.group(0)
+        } for start, end, match in _iter_page_matches(pages, _RE_QUESTION_NO))
         
         # Answer: 패턴 찾기
-        answer_pattern = r'Answer:\s*'
-        for match in re.finditer(answer_pattern, full_text, re.IGNORECASE):
-            markers.append({
-                'type': 'answer',
-                'number': None,  # 나중에 연결
-                'position': match.start(),
-                'text': match.group(0)
-            })
-        
-        # 위치순으로 정렬
-        markers.sort(key=lambda x: x['position'])
-        
-        # Answer를 해당 Question에 연결
+        answer_markers = ({
+            'type': 'answer',
+            'number': None,  # 나중에 연결
+            'position': start,
+            'end': end,
+            'text': match.group(0)
+        } for start, end, match in _iter_page_matches(pages, _RE_ANSWER))
+        
+        # 두 스트림 모두 위치순이므로 병합만 하면 정렬된 결과가 됨
+        # 병합하면서 Answer를 해당 Question에 연결
+        markers = []
         current_question = None
-        for marker in markers:
+        for marker in heapq.merge(question_markers, answer_markers, key=lambda x: x['position']):
             if marker['type'] == 'question':
                 current_question = marker['number']
-            elif marker['type'] == 'answer' and current_question:
+            elif current_question:
                 marker['number'] = current_question
+            markers.append(marker)
         
         return markers
     
-    def _extract_images_with_positions(self) -> Dict[int, List[Dict[str, any]]]:
-        """페이지별로 이미지와 대략적인 텍스트 위치 추출"""
-        if not HAS_PYMUPDF:
-            raise PDFExtractionError("이미지 위치 분석을 위해서는 PyMuPDF가 필요합니다.")
+    def _split_question_texts(self, text_markers: List[Dict[str, any]], 
+                              pages: List[Dict[str, any]]) -> Dict[int, str]:
+        """QUESTION NO: 마커 사이의 텍스트를 문제별로 분할 (split_text_by_questions와 동일한 결과)"""
+        question_markers = [m for m in text_markers if m['type'] == 'question']
+        offsets = [page['offset'] for page in pages]
+        text_end = pages[-1]['offset'] + len(pages[-1]['text']) + 1 if pages else 0
         
-        page_images = {}
+        question_texts = {}
+        for i, marker in enumerate(question_markers):
+            if i + 1 < len(question_markers):
+                end = question_markers[i + 1]['position']
+            else:
+                end = text_end
+            
+            content = self._slice_text(pages, offsets, marker['end'], end).strip()
+            if content:
+                question_texts[marker['number']] = content
         
-        try:
-            doc = fitz.open(self.pdf_path)
-            cumulative_text_length = 0
+        return question_texts
+    
+    def _slice_text(self, pages: List[Dict[str, any]], offsets: List[int], start: int, end: int) -> str:
+        """전체 텍스트 기준 [start, end) 구간을 해당 페이지들의 텍스트로 조합"""
+        parts = []
+        i = max(bisect.bisect_right(offsets, start) - 1, 0)
+        
+        while i < len(pages) and pages[i]['offset'] < end:
+            page_text = pages[i]['text']
+            lo = max(start - pages[i]['offset'], 0)
+            hi = end - pages[i]['offset']
+            parts.append(page_text[lo:hi])
+            if lo <= len(page_text) < hi:
+                parts.append("\n")  # 페이지 구분 줄바꿈
+            i += 1
+        
+        return "".join(parts)
+    
+    def _extract_images_with_positions(self, pages: List[Dict[str, any]]) -> Dict[str, array]:
+        """스캔 결과로부터 모든 이미지의 대략적인 텍스트 위치 추출
+        
+        이미지 정보는 위치순으로 정렬된 병렬 배열로 반환한다:
+        {'xrefs': [...], 'positions': [...]}
+        """
+        xrefs = array('q')
+        positions = array('q')
+        for page in pages:
+            page_text = page['text']
+            page_height = page['height']
+            page_start_pos = page['offset']
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                page_start_pos = cumulative_text_length
-                page_end_pos = cumulative_text_length + len(page_text)
-                
-                images = []
-                image_list = page.get_images(full=True)
-                
-                for img_index, img in enumerate(image_list):
-                    try:
-                        # 이미지 위치 정보 (페이지 내)
-                        img_rects = page.get_image_rects(img[0])
-                        if img_rects:
-                            img_rect = img_rects[0]
-                            y_pos_in_page = img_rect[1]  # Y 좌표
-                        else:
-                            y_pos_in_page = 0
-                        
-                        # 전체 텍스트에서의 대략적인 위치 추정
-                        # 페이지 내 Y 위치 비율을 이용해 텍스트 위치 추정
-                        page_height = page.rect.height
-                        if page_height > 0:
-                            y_ratio = y_pos_in_page / page_height
-                            estimated_text_pos = page_start_pos + int(len(page_text) * y_ratio)
-                        else:
-                            estimated_text_pos = page_start_pos
-                        
-                        images.append({
-                            'img_data': img,
-                            'img_index': img_index,
-                            'page_num': page_num,
-                            'y_pos_in_page': y_pos_in_page,
-                            'estimated_text_pos': estimated_text_pos,
-                            'page_start_pos': page_start_pos,
-                            'page_end_pos': page_end_pos
-                        })
-                        
-                    except Exception as e:
-                        print(f"페이지 {page_num+1}, 이미지 {img_index+1} 위치 분석 실패: {e}")
-                        continue
-                
-                page_images[page_num] = images
-                cumulative_text_length = page_end_pos + 1  # +1 for page break
+            # 이미지 위치 정보 (페이지 내 Y 좌표, 배치 정보가 없는 이미지는 0)
+            # 스캔 단계에서 위치 분석에 실패한 페이지의 이미지는 제외
+            image_bboxes = page['image_bboxes']
+            if image_bboxes is None:
+                located = []
+            else:
+                located = [
+                    (xref, image_bboxes[xref][1] if xref in image_bboxes else 0)
+                    for xref in page['image_xrefs']
+                ]
             
-            doc.close()
+            # 전체 텍스트에서의 대략적인 위치 추정
+            # 페이지 내 Y 위치 비율을 이용해 텍스트 위치 추정 (페이지 상수는 한 번만 계산)
+            text_len = len(page_text)
+            if page_height > 0:
+                positions.extend(page_start_pos + int(text_len * (y_pos / page_height))
+                                 for _, y_pos in located)
+            else:
+                positions.extend([page_start_pos] * len(located))
             
-        except Exception as e:
-            raise PDFExtractionError(f"이미지 위치 분석 실패: {e}")
-        
-        return page_images
+            xrefs.extend(xref for xref, _ in located)
+        
+        # 위치순 정렬 (같은 위치는 페이지/페이지 내 순서 유지)
+        order = sorted(range(len(positions)), key=positions.__getitem__)
+        return {
+            'xrefs': array('q', (xrefs[i] for i in order)),
+            'positions': array('q', (positions[i] for i in order))
+        }
     
     def _map_images_by_text_order(self, text_markers: List[Dict[str, any]], 
-                                page_images: Dict[int, List[Dict[str, any]]], 
-                                full_text: str) -> List[QuestionAnswer]:
+                                images: Dict[str, array], 
+                                pages: List[Dict[str, any]]) -> List[QuestionAnswer]:
         """텍스트 순서를 기반으로 이미지를 Question/Answer에 매핑"""
         
-        # 모든 이미지를 하나의 리스트로 합치고 위치순 정렬
-        all_images = []
-        for page_num, images in page_images.items():
-            all_images.extend(images)
-        
-        all_images.sort(key=lambda x: x['estimated_text_pos'])
+        # 이미지는 이미 위치순으로 정렬되어 있음
+        xrefs = images['xrefs']
+        positions = images['positions']
         
         # 각 문제별로 Question과 Answer 영역 정의
         question_ranges = self._define_question_ranges(text_markers)
         
         # 각 문제별로 이미지 분류
-        question_images = {}  # {question_no: {'question': [images], 'answer': [images]}}
-        
-        for question_no, ranges in question_ranges.items():
-            question_images[question_no] = {'question': [], 'answer': []}
-            
-            question_start = ranges['question_start']
-            question_end = ranges['question_end']
-            answer_start = ranges['answer_start']
-            answer_end = ranges['answer_end']
-            
-            # 해당 범위에 있는 이미지들 찾기
-            for img_info in all_images:
-                img_pos = img_info['estimated_text_pos']
-                
-                # Question 영역 (QUESTION NO: ~ Answer: 사이)
-                if question_start <= img_pos < question_end:
-                    question_images[question_no]['question'].append(img_info)
-                    
-                # Answer 영역 (Answer: ~ 다음 QUESTION NO: 사이)
-                elif answer_start <= img_pos < answer_end:
-                    question_images[question_no]['answer'].append(img_info)
+        # 모든 영역 경계의 위치 배열 인덱스를 한 번에 구한 뒤 xref 배열을 슬라이스
+        region_keys = ('question_start', 'question_end', 'answer_start', 'answer_end')
+        bounds = [ranges[key] for ranges in question_ranges.values() for key in region_keys]
+        bound_indices = _searchsorted(positions, bounds)
+        
+        question_images = {}  # {question_no: {'question': [xrefs], 'answer': [xrefs]}}
+        
+        for k, question_no in enumerate(question_ranges):
+            # Question 영역 (QUESTION NO: ~ Answer: 사이), Answer 영역 (Answer: ~ 다음 QUESTION NO: 사이)
+            q_lo, q_hi, a_lo, a_hi = bound_indices[4 * k:4 * k + 4]
+            question_images[question_no] = {
+                'question': xrefs[q_lo:q_hi],
+                'answer': xrefs[a_lo:a_hi]
+            }
         
         # 이미지 저장 및 QA 쌍 생성
         qa_pairs = []
         
         # 문제별 텍스트 추출
-        question_texts = split_text_by_questions(full_text)
+        question_texts = self._split_question_texts(text_markers, pages)
         
         for question_no in sorted(question_ranges.keys()):
             try:
@@ -279,14 +518,12 @@ class TextBasedImageMapper:
                     answer_text = "[답변이 제공되지 않음]"
                 
                 # 이미지 저장
-                q_images = question_images.get(question_no, {}).get('question', [])
-                a_images = question_images.get(question_no, {}).get('answer', [])
-                
-                question_image_files = self._save_images_with_naming(q_images, question_no, 'question')
-                answer_image_files = self._save_images_with_naming(a_images, question_no, 'answer')
+                regions = question_images[question_no]
+                question_image_files = self._save_images_with_naming(regions['question'], question_no, 'question')
+                answer_image_files = self._save_images_with_naming(regions['answer'], question_no, 'answer')
                 
                 # QA 쌍 생성
-                all_image_files = question_image_files + answer_image_files
+                all_image_files = [*question_image_files, *answer_image_files]
                 
                 qa_pair = QuestionAnswer(
                     question_no=question_no,
@@ -316,110 +553,121 @@ class TextBasedImageMapper:
         return qa_pairs
     
     def _define_question_ranges(self, text_markers: List[Dict[str, any]]) -> Dict[int, Dict[str, int]]:
-        """각 문제의 Question과 Answer 영역 범위 정의"""
+        """각 문제의 Question과 Answer 영역 범위 정의 (위치순 마커를 한 번만 순회)"""
         ranges = {}
-        
-        # 문제 번호별로 마커들 그룹화
-        question_markers = [m for m in text_markers if m['type'] == 'question']
-        answer_markers = [m for m in text_markers if m['type'] == 'answer']
-        
-        for i, q_marker in enumerate(question_markers):
-            question_no = q_marker['number']
-            question_start = q_marker['position']
-            
-            # 해당 문제의 Answer: 찾기
-            answer_marker = None
-            for a_marker in answer_markers:
-                if a_marker['number'] == question_no and a_marker['position'] > question_start:
-                    answer_marker = a_marker
-                    break
-            
-            if answer_marker:
-                question_end = answer_marker['position']
-                answer_start = answer_marker['position']
-                
-                # 다음 문제의 시작점 찾기
-                if i + 1 < len(question_markers):
-                    answer_end = question_markers[i + 1]['position']
-                else:
-                    answer_end = float('inf')  # 마지막 문제
+        current = None  # 진행 중인 문제: {'number', 'start', 'answer'}
+        
+        def close_current(end):
+            answer_pos = current['answer']
+            if answer_pos is not None:
+                question_end = answer_pos
+                answer_start = answer_pos
+                answer_end = end
             else:
                 # Answer:가 없는 경우
-                if i + 1 < len(question_markers):
-                    question_end = question_markers[i + 1]['position']
-                else:
-                    question_end = float('inf')
-                
-                answer_start = question_end
-                answer_end = question_end
+                question_end = end
+                answer_start = end
+                answer_end = end
             
-            ranges[question_no] = {
-                'question_start': question_start,
+            ranges[current['number']] = {
+                'question_start': current['start'],
                 'question_end': question_end,
                 'answer_start': answer_start,
                 'answer_end': answer_end
             }
         
+        for marker in text_markers:
+            if marker['type'] == 'question':
+                # 다음 문제의 시작점이 이전 문제 영역의 끝
+                if current is not None:
+                    close_current(marker['position'])
+                current = {'number': marker['number'], 'start': marker['position'], 'answer': None}
+            elif (current is not None and current['answer'] is None
+                  and marker['number'] == current['number']):
+                # 해당 문제의 첫 번째 Answer:
+                current['answer'] = marker['position']
+        
+        if current is not None:
+            close_current(float('inf'))  # 마지막 문제
+        
         return ranges
     
-    def _save_images_with_naming(self, images: List[Dict[str, any]], 
-                               question_no: int, region_type: str) -> List[str]:
-        """이미지들을 적절한 이름으로 저장"""
-        if not HAS_PYMUPDF or not images:
-            return []
-        
-        saved_files = []
+    def _save_images_with_naming(self, xrefs: Sequence[int], 
+                               question_no: int, region_type: str) -> Sequence[str]:
+        """이미지들을 적절한 이름으로 저장 (대부분의 영역은 이미지가 없으므로 먼저 확인)"""
+        if not xrefs or self._image_exporter is None:
+            return _NO_IMAGES
+        
+        # 파일명 생성: question_5_img_1.png 또는 answer_5_img_1.png
+        items = [
+            (xref, f"{region_type}_{question_no}_img_{img_index + 1}.png")
+            for img_index, xref in enumerate(xrefs)
+        ]
         
         try:
-            doc = fitz.open(self.pdf_path)
-            
-            for img_index, img_info in enumerate(images):
-                try:
-                    img_data = img_info['img_data']
-                    xref = img_data[0]
-                    pix = fitz.Pixmap(doc, xref)
-                    
-                    # 파일명 생성: question_5_img_1.png 또는 answer_5_img_1.png
-                    filename = f"{region_type}_{question_no}_img_{img_index + 1}.png"
-                    filepath = os.path.join(self.image_dir, filename)
-                    
-                    # CMYK를 RGB로 변환
-                    if pix.n - pix.alpha >= 4:
-                        pix1 = fitz.Pixmap(fitz.csRGB, pix)
-                        pix1.save(filepath)
-                        pix1 = None
-                    else:
-                        pix.save(filepath)
-                    
-                    pix = None
-                    saved_files.append(filename)
-                    
-                except Exception as e:
-                    print(f"이미지 저장 실패 ({region_type}_{question_no}_img_{img_index + 1}): {e}")
-                    continue
-            
-            doc.close()
-            
+            return self._image_exporter.save_many(items)
         except Exception as e:
             print(f"이미지 저장 중 오류: {e}")
-        
-        return saved_files
+            return _NO_IMAGES
 
 class SimpleExtractor:
     """간단한 추출 방식 (기존 방식과 호환)"""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, image_dir: str = "extracted_images"):
         self.pdf_path = pdf_path
-        self.extractor = PDFExtractor(pdf_path)
+        self.extractor = PDFExtractor(pdf_path, image_dir)
+        self._doc = fitz.open(pdf_path) if HAS_PYMUPDF else None
+        self._image_exporter = ImageExporter(self._doc, self.extractor.image_dir) if self._doc is not None else None
+    
+    def close(self):
+        """열어둔 PDF 문서 닫기"""
+        if self._image_exporter is not None:
+            self._image_exporter.close()
+            self._image_exporter = None
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _scan_pages(self) -> Tuple[str, Dict[int, Tuple[str, List[int]]]]:
+        """페이지를 한 번 순회하며 전체 텍스트와 페이지별 대표 문제 번호/이미지 xref 수집
+        
+        Returns:
+            (전체 텍스트, {페이지 번호: (페이지의 첫 번째 QUESTION NO: 번호, 페이지 이미지 xref 목록)})
+        """
+        page_primary_question = {}
+        
+        if self._doc is None:
+            return self.extractor.extract_text_simple(), page_primary_question
+        
+        parts = []
+        for page_num, page in enumerate(self._doc):
+            page_text = page.get_text()
+            if page_text:
+                parts.append(page_text)
+                parts.append("\n")
+                
+                # 페이지에서 첫 번째 QUESTION NO: 패턴 찾기
+                question_match = _RE_QUESTION_NO.search(page_text)
+                if question_match:
+                    xrefs = [img[0] for img in page.get_images()]
+                    page_primary_question[page_num] = (question_match.group(1), xrefs)
+        
+        return "".join(parts), page_primary_question
     
     def extract_qa_pairs(self) -> List[QuestionAnswer]:
         """기본 질문-답변 쌍 추출"""
         try:
             # 텍스트 추출
-            text = self.extractor.extract_text_simple()
+            text, page_primary_question = self._scan_pages()
             
             # 문제별 이미지 추출 (기존 방식)
-            question_images = self._extract_images_by_question()
+            question_images = self._extract_images_by_question(page_primary_question)
             
             # 텍스트 파싱
             qa_pairs = self._parse_text_to_qa_pairs(text, question_images)
@@ -429,54 +677,31 @@ class SimpleExtractor:
         except Exception as e:
             raise PDFExtractionError(f"간단 추출 실패: {e}")
     
-    def _extract_images_by_question(self) -> Dict[str, List[str]]:
+    def _extract_images_by_question(self, page_primary_question: Dict[int, Tuple[str, List[int]]]) -> Dict[str, List[str]]:
         """문제 번호 기준으로 이미지 추출 (기존 방식)"""
         question_images = {}
         
-        if not HAS_PYMUPDF:
+        if self._doc is None:
             return question_images
         
         try:
-            doc = fitz.open(self.pdf_path)
             total_images = 0
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                
-                # 페이지에서 QUESTION NO: 패턴 찾기
-                question_matches = re.findall(r'QUESTION NO:\s*(\d+)', page_text)
-                image_list = page.get_images(full=True)
-                
-                if image_list and question_matches:
-                    primary_question = question_matches[0]
+            # QUESTION NO:가 있는 페이지만 이미지 확인
+            for primary_question, image_xrefs in page_primary_question.values():
+                if image_xrefs:
+                    items = [
+                        (xref, f"question_{primary_question}_img_{img_index+1}.png")
+                        for img_index, xref in enumerate(image_xrefs)
+                    ]
+                    saved_files = self._image_exporter.save_many(items)
                     
-                    for img_index, img in enumerate(image_list):
-                        try:
-                            xref = img[0]
-                            pix = fitz.Pixmap(doc, xref)
-                            
-                            image_filename = f"question_{primary_question}_img_{img_index+1}.png"
-                            image_path = os.path.join(self.extractor.image_dir, image_filename)
-                            
-                            if pix.n - pix.alpha < 4:
-                                pix.save(image_path)
-                            else:
-                                pix1 = fitz.Pixmap(fitz.csRGB, pix)
-                                pix1.save(image_path)
-                                pix1 = None
-                            
-                            if primary_question not in question_images:
-                                question_images[primary_question] = []
-                            question_images[primary_question].append(image_filename)
-                            total_images += 1
-                            pix = None
-                            
-                        except Exception as e:
-                            print(f"이미지 추출 실패: {e}")
-                            continue
+                    if saved_files:
+                        if primary_question not in question_images:
+                            question_images[primary_question] = []
+                        question_images[primary_question].extend(saved_files)
+                        total_images += len(saved_files)
             
-            doc.close()
             print(f"총 {total_images}개의 이미지를 추출했습니다.")
             
         except Exception as e:
@@ -517,13 +742,15 @@ class SimpleExtractor:
         
         return qa_pairs
 
-def extract_cka_data(pdf_path: str, use_enhanced: bool = True) -> Tuple[List[QuestionAnswer], ExtractionStats]:
+def extract_cka_data(pdf_path: str, use_enhanced: bool = True,
+                     image_dir: str = "extracted_images") -> Tuple[List[QuestionAnswer], ExtractionStats]:
     """
     CKA PDF에서 데이터 추출
     
     Args:
         pdf_path: PDF 파일 경로
         use_enhanced: 개선된 텍스트 순서 기반 이미지 매핑 사용 여부
+        image_dir: 추출한 이미지를 저장할 디렉토리
     
     Returns:
         (질문답변_리스트, 통계정보)
@@ -534,13 +761,13 @@ def extract_cka_data(pdf_path: str, use_enhanced: bool = True) -> Tuple[List[Que
         if use_enhanced and HAS_PYMUPDF:
             # 개선된 추출 (텍스트 순서 기반 Question/Answer 이미지 분리)
             print("🔧 개선된 추출 방식: 텍스트 순서 기반 이미지 매핑")
-            extractor = TextBasedImageMapper(pdf_path)
-            qa_pairs = extractor.extract_qa_pairs_with_text_mapping()
+            with TextBasedImageMapper(pdf_path, image_dir) as extractor:
+                qa_pairs = extractor.extract_qa_pairs_with_text_mapping()
         else:
             # 간단한 추출 (기존 방식)
             print("📝 기본 추출 방식 사용")
-            simple_extractor = SimpleExtractor(pdf_path)
-            qa_pairs = simple_extractor.extract_qa_pairs()
+            with SimpleExtractor(pdf_path, image_dir) as simple_extractor:
+                qa_pairs = simple_extractor.extract_qa_pairs()
         
         # 통계 계산
         stats = calculate_statistics(qa_pairs)
@@ -9,22 +9,28 @@ CKA PDF 질문답변 및 이미지 추출기 - 메인 실행 파일
     python main.py "CKA V13.95.pdf"
     python main.py "CKA V13.95.pdf" --sequential
     python main.py "CKA V13.95.pdf" --simple
+    python main.py a.pdf b.pdf c.pdf --jobs 4
     python main.py --help
 """
 
 import sys
 import os
+import io
+import time
 import argparse
-from typing import Optional
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional, List
 
 # 로컬 모듈 임포트
 try:
     from models import QuestionAnswer, ExtractionStats
     from extractor import extract_cka_data, PDFExtractionError
     from utils import (
-        validate_pdf_path, print_dependency_status, 
-        save_questions_only, save_answers_only, save_combined_qa, 
-        save_as_json, save_as_csv, get_file_info
+        stat_pdf_path, print_dependency_status, 
+        save_text_outputs, 
+        save_as_json, save_as_csv, get_file_info, merge_statistics
     )
     # 순차적 추출기는 선택적 임포트
     try:
@@ -38,6 +44,19 @@ except ImportError as e:
     print("필요한 파일들이 같은 디렉토리에 있는지 확인해주세요.")
     sys.exit(1)
 
+# 순차적 추출 이미지를 모아 두는 바이너리 사이드카 파일
+IMAGE_SIDECAR_FILE = "cka_qa_images.bin"
+
+# 추출 방식별 안내 문구
+_METHOD_NAMES = {
+    'sequential': "[SEQUENTIAL] 순차적 추출 방식 (텍스트-이미지 순서 보존, base64)",
+    'enhanced': "[ENHANCED] 개선된 추출 방식 (Question/Answer 이미지 분리)", 
+    'simple': "[SIMPLE] 기본 추출 방식 (기존 방식)"
+}
+
+# PDF 경로가 주어지지 않았을 때 찾아볼 기본 파일명
+_DEFAULT_FILES = ("CKA V13.95.pdf", "cka.pdf", "CKA.pdf")
+
 def parse_arguments():
     """명령행 인수 파싱"""
     parser = argparse.ArgumentParser(
@@ -48,6 +67,8 @@ def parse_arguments():
   python main.py "CKA V13.95.pdf"              # 개선된 추출 (기본값)
   python main.py input.pdf --sequential        # 순차적 추출 (base64)
   python main.py input.pdf --simple            # 간단한 추출 (기존 방식)
+  python main.py a.pdf b.pdf --jobs 4          # 여러 PDF 병렬 추출 (PDF별 하위 디렉토리)
+  python main.py input.pdf --sequential --jobs 4  # 순차적 추출을 페이지 구간별로 병렬 처리
   python main.py --check-deps                  # 의존성 확인만
   
 출력 파일:
@@ -56,14 +77,16 @@ def parse_arguments():
   - cka_questions_answers.txt  : 질문과 답변 결합
   - cka_qa_data.json          : JSON 형태 데이터
   - cka_qa_data.csv           : CSV 형태 데이터
+  - cka_qa_images.bin         : 이미지 바이너리 (--sequential --binary-images 사용 시)
   - extracted_images/         : 추출된 이미지 파일들 (파일명 방식)
         """
     )
     
     parser.add_argument(
-        "pdf_path", 
-        nargs="?",
-        help="PDF 파일 경로"
+        "pdf_paths", 
+        nargs="*",
+        metavar="pdf_path",
+        help="PDF 파일 경로 (여러 개 지정 시 프로세스 풀로 병렬 처리)"
     )
     
     parser.add_argument(
@@ -108,16 +131,34 @@ def parse_arguments():
         help="CSV 파일 생성 안함"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--binary-images", 
+        action="store_true",
+        help="순차적 추출 시 이미지를 base64 대신 cka_qa_images.bin 파일에 모아 저장"
+    )
+    
+    parser.add_argument(
+        "--jobs", 
+        type=int,
+        default=None,
+        help="동시에 실행할 프로세스 수 (여러 PDF: 기본값 CPU 수, 최대 6 / 단일 PDF 순차적 추출: 지정한 경우에만 페이지 병렬 처리)"
+    )
+    
+    args = parser.parse_args()
+    
+    # 이미지 사이드카는 이미지를 JSON에 담는 순차적 추출에서만 의미가 있음
+    if args.binary_images and not args.sequential:
+        parser.error("--binary-images는 --sequential과 함께 사용해야 합니다")
+    
+    return args
 
-def check_pdf_file(pdf_path: str) -> bool:
-    """PDF 파일 존재 및 유효성 확인"""
+def check_pdf_file(pdf_path: str) -> Optional[os.stat_result]:
+    """PDF 파일 존재 및 유효성 확인 (유효하면 stat 결과 반환)"""
     try:
-        validate_pdf_path(pdf_path)
-        return True
+        return stat_pdf_path(pdf_path)
     except (ValueError, FileNotFoundError) as e:
         print(f"오류: {e}")
-        return False
+        return None
 
 def get_pdf_path_interactive() -> Optional[str]:
     """대화형으로 PDF 파일 경로 입력받기"""
@@ -134,24 +175,64 @@ def get_pdf_path_interactive() -> Optional[str]:
         # 따옴표 제거
         pdf_path = pdf_path.strip('"\'')
         
-        if check_pdf_file(pdf_path):
+        if check_pdf_file(pdf_path) is not None:
             return pdf_path
         
         print("다시 입력해주세요.\n")
 
-def display_file_info(pdf_path: str):
+def display_file_info(pdf_path: str, stat_result: Optional[os.stat_result] = None):
     """PDF 파일 정보 표시"""
-    info = get_file_info(pdf_path)
+    info = get_file_info(pdf_path, stat_result)
     if info.get('exists'):
         print(f"파일 크기: {info['size_formatted']}")
 
-def save_all_outputs(qa_pairs, extraction_method, args):
+def pack_images_to_sidecar(images_data, image_sink):
+    """ImagePayload를 사이드카 파일에 이어 쓰고 바이트 범위 참조 목록 반환"""
+    packed = []
+    for image in images_data:
+        offset = image_sink.tell()
+        image_sink.write(image.data)
+        
+        packed.append({
+            'type': image.region,
+            'format': image.format,
+            'width': image.width,
+            'height': image.height,
+            'bin': IMAGE_SIDECAR_FILE,
+            'offset': offset,
+            'length': len(image.data),
+            'mime': image.mime
+        })
+    return packed
+
+def iter_json_records(qa_pairs, image_sink=None):
+    """웹페이지용 JSON 레코드를 문제 하나씩 생성 (image_sink가 있으면 이미지는 사이드카로)"""
+    for qa in qa_pairs:
+        if qa.image_mode == 'embedded':
+            # Sequential 방식: 이미지 데이터를 JSON에 포함 (또는 사이드카 참조)
+            if image_sink is not None:
+                images_data = pack_images_to_sidecar(qa.images, image_sink)
+            else:
+                images_data = [image.to_web_format() for image in qa.images]
+        else:
+            # 기존 파일 방식: 파일명만 있는 경우 (현재는 지원하지 않음)
+            images_data = []
+        
+        yield {
+            'question_no': qa.question_no,
+            'question': qa.question,
+            'answer': qa.answer,
+            'has_images': qa.has_images,
+            'images': images_data
+        }
+
+def save_all_outputs(qa_pairs, extraction_method, args, output_dir=None):
     """모든 출력 파일 저장"""
-    output_dir = args.output_dir
+    if output_dir is None:
+        output_dir = args.output_dir
     
     # 출력 디렉토리 생성
-    if output_dir != "." and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
     
     # 파일 경로 설정
     def get_output_path(filename):
@@ -162,38 +243,22 @@ def save_all_outputs(qa_pairs, extraction_method, args):
             print("파일 저장 중...")
         
         # 텍스트 파일들
-        save_questions_only(qa_pairs, get_output_path("cka_questions_only.txt"))
-        save_answers_only(qa_pairs, get_output_path("cka_answers_only.txt"))
-        save_combined_qa(qa_pairs, get_output_path("cka_questions_answers.txt"))
+        save_text_outputs(
+            qa_pairs,
+            get_output_path("cka_questions_only.txt"),
+            get_output_path("cka_answers_only.txt"),
+            get_output_path("cka_questions_answers.txt")
+        )
         
-        # JSON 파일 (웹페이지용)
-        basic_data = []
-        for qa in qa_pairs:
-            # Sequential 방식에서는 images가 dict 객체들의 리스트일 수 있음
-            images_data = qa.images
-            if images_data and isinstance(images_data[0], dict):
-                # Sequential 방식: 이미 올바른 형태
-                pass
-            elif images_data and isinstance(images_data[0], str):
-                # 기존 파일 방식: 파일명만 있는 경우 (현재는 지원하지 않음)
-                images_data = []
-            
-            qa_dict = {
-                'question_no': qa.question_no,
-                'question': qa.question,
-                'answer': qa.answer,
-                'has_images': qa.has_images,
-                'images': images_data or []
-            }
-            basic_data.append(qa_dict)
-            
-        save_as_json(basic_data, get_output_path("cka_qa_data.json"))
+        # JSON 파일 (웹페이지용, 문제별로 바로 직렬화하여 전체 목록을 만들지 않음)
+        use_sidecar = args.binary_images and extraction_method == 'sequential'
+        with (open(get_output_path(IMAGE_SIDECAR_FILE), 'wb') if use_sidecar
+              else contextlib.nullcontext()) as image_sink:
+            save_as_json(iter_json_records(qa_pairs, image_sink), get_output_path("cka_qa_data.json"))
         
-        # CSV 파일 (순차적 방식은 복잡한 이미지 데이터로 인해 스킵)
-        if not args.no_csv and extraction_method != 'sequential':
+        # CSV 파일 (순차적 방식은 base64 데이터 대신 이미지 개수만 기록)
+        if not args.no_csv:
             save_as_csv(qa_pairs, get_output_path("cka_qa_data.csv"))
-        elif extraction_method == 'sequential' and not args.quiet:
-            print("순차적 방식은 CSV 생성을 건너뜁니다 (base64 이미지 데이터 포함)")
         
         return True
         
@@ -201,28 +266,121 @@ def save_all_outputs(qa_pairs, extraction_method, args):
         print(f"파일 저장 중 오류: {e}")
         return False
 
+def resolve_extraction_method(args) -> Optional[str]:
+    """명령행 옵션으로 추출 방식 결정 (사용 불가 시 None)"""
+    if args.sequential:
+        if not HAS_SEQUENTIAL:
+            print("오류: sequential_extractor.py 파일이 없습니다.")
+            print("순차적 추출을 사용하려면 sequential_extractor.py가 필요합니다.")
+            return None
+        return 'sequential'
+    elif args.simple:
+        return 'simple'
+    elif args.enhanced:
+        return 'enhanced'
+    return 'enhanced'  # 기본값
+
+def run_extraction(pdf_path: str, extraction_method: str, image_dir: str = "extracted_images", jobs: int = 1):
+    """추출 방식에 맞는 추출기 실행 (jobs는 순차적 추출의 페이지 병렬 처리에만 사용)"""
+    if extraction_method == 'sequential':
+        return extract_cka_data_sequential(pdf_path, jobs=jobs)
+    use_enhanced = (extraction_method == 'enhanced')
+    return extract_cka_data(pdf_path, use_enhanced=use_enhanced, image_dir=image_dir)
+
+def batch_output_dirs(pdf_paths: List[str], base_dir: str) -> List[str]:
+    """PDF별 출력 디렉토리 목록 (파일 이름이 겹치면 cka, cka_2, cka_3 ... 처럼 구분)"""
+    output_dirs = []
+    used = set()
+    for pdf_path in pdf_paths:
+        stem = os.path.splitext(os.path.basename(pdf_path))[0]
+        name = stem
+        suffix = 2
+        # 다른 폴더의 같은 이름 PDF가 같은 디렉토리에 동시에 쓰지 않도록 한다
+        while name.lower() in used:
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        used.add(name.lower())
+        if name != stem:
+            print(f"경고: 같은 이름의 PDF가 있어 {pdf_path}의 결과는 {name}/에 저장합니다.")
+        output_dirs.append(os.path.join(base_dir, name))
+    return output_dirs
+
+def _process_one(pdf_path: str, output_dir: str, extraction_method: str, args):
+    """작업 프로세스에서 PDF 하나를 추출하여 output_dir에 저장"""
+    # 문서 객체는 피클링되지 않으므로 경로만 전달받아 프로세스 안에서 직접 연다
+    try:
+        # 여러 프로세스의 진행 로그가 섞이지 않도록 작업 중 출력은 버린다
+        with contextlib.redirect_stdout(io.StringIO()):
+            qa_pairs, stats = run_extraction(
+                pdf_path, extraction_method, os.path.join(output_dir, "extracted_images"))
+            if not qa_pairs:
+                return pdf_path, None, "문제를 찾을 수 없습니다"
+            if not save_all_outputs(qa_pairs, extraction_method, args, output_dir):
+                return pdf_path, None, "일부 파일 저장 실패"
+        return pdf_path, stats, None
+    except Exception as e:
+        return pdf_path, None, str(e)
+
+def process_batch(pdf_paths: List[str], extraction_method: str, args):
+    """여러 PDF를 프로세스 풀로 병렬 추출"""
+    pdf_paths = [path for path in pdf_paths if check_pdf_file(path) is not None]
+    if not pdf_paths:
+        return
+    
+    jobs = args.jobs if args.jobs is not None else min(os.cpu_count() or 1, 6)
+    jobs = max(1, min(jobs, len(pdf_paths)))
+    output_dirs = batch_output_dirs(pdf_paths, args.output_dir)
+    print(f"{len(pdf_paths)}개 PDF를 {jobs}개 프로세스로 추출 중...")
+    
+    start_time = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for pdf_path, stats, error in executor.map(
+                _process_one, pdf_paths, output_dirs, repeat(extraction_method), repeat(args)):
+            if error:
+                print(f"실패: {pdf_path} ({error})")
+            else:
+                print(f"완료: {pdf_path} - {stats.total_questions}개 문제, {stats.total_images}개 이미지")
+                results.append(stats)
+    
+    if results:
+        # 처리 시간은 PDF별 합계 대신 전체 경과 시간으로 표시
+        merged = merge_statistics(results)
+        merged.processing_time = time.time() - start_time
+        if args.quiet:
+            print(f"전체: {merged.total_questions}개 문제, {merged.total_images}개 이미지")
+        else:
+            print(merged)
+
 def display_results(qa_pairs, stats, extraction_method, args):
     """결과 표시"""
     if args.quiet:
         print(f"완료: {stats.total_questions}개 문제, {stats.total_images}개 이미지")
         return
     
+    # 출력 줄을 모아 두었다가 마지막에 한 번에 기록 (병렬 실행 시에도 출력이 섞이지 않음)
+    lines = []
+    out = lines.append
+    
     # 통계 정보
-    print(stats)
+    out(str(stats))
     
     # 추출 방식별 안내
     if extraction_method == 'sequential':
-        print("\n=== 순차적 추출 방식 결과 ===")
-        print("- 이미지가 JSON에 base64로 포함됨")
-        print("- 별도 이미지 폴더 불필요")
-        print("- 텍스트와 이미지 순서 보존")
+        out("\n=== 순차적 추출 방식 결과 ===")
+        if args.binary_images:
+            out(f"- 이미지가 {IMAGE_SIDECAR_FILE}에 모여 저장되고 JSON에는 위치만 기록됨")
+        else:
+            out("- 이미지가 JSON에 base64로 포함됨")
+        out("- 별도 이미지 폴더 불필요")
+        out("- 텍스트와 이미지 순서 보존")
     else:
-        print(f"\n=== {'개선된' if extraction_method == 'enhanced' else '기본'} 추출 방식 결과 ===")
-        print("- 이미지가 별도 파일로 저장됨")
-        print("- extracted_images/ 폴더와 함께 사용")
+        out(f"\n=== {'개선된' if extraction_method == 'enhanced' else '기본'} 추출 방식 결과 ===")
+        out("- 이미지가 별도 파일로 저장됨")
+        out("- extracted_images/ 폴더와 함께 사용")
     
     # 파일 목록
-    print("\n=== 생성된 파일 ===")
+    out("\n=== 생성된 파일 ===")
     files = [
         "cka_questions_only.txt - 질문만 모음",
         "cka_answers_only.txt - 답변만 모음",
@@ -230,37 +388,50 @@ def display_results(qa_pairs, stats, extraction_method, args):
         "cka_qa_data.json - JSON 형태 데이터 (웹페이지용)"
     ]
     
+    if extraction_method == 'sequential' and args.binary_images:
+        files.append(f"{IMAGE_SIDECAR_FILE} - 이미지 바이너리 (JSON과 함께 사용)")
+    
     if extraction_method != 'sequential':
         files.append("extracted_images/ - 추출된 이미지 파일들")
-        if not args.no_csv:
-            files.append("cka_qa_data.csv - CSV 형태 데이터")
+    
+    if not args.no_csv:
+        files.append("cka_qa_data.csv - CSV 형태 데이터")
     
     for file_desc in files:
-        print(f"  {file_desc}")
+        out(f"  {file_desc}")
     
     # 이미지가 포함된 문제들
     image_questions = [qa for qa in qa_pairs if qa.has_images]
     if image_questions:
-        print(f"\n=== 이미지가 포함된 문제 목록 ===")
+        out(f"\n=== 이미지가 포함된 문제 목록 ===")
         for qa in image_questions[:10]:  # 최대 10개만 표시
-            if extraction_method == 'sequential':
-                q_count = len([img for img in qa.images if img.get('type') == 'question'])
-                a_count = len([img for img in qa.images if img.get('type') == 'answer'])
-                print(f"문제 {qa.question_no}: Question {q_count}개, Answer {a_count}개 이미지")
+            if qa.image_mode == 'embedded':
+                # 한 번의 순회로 Question/Answer 이미지 수를 함께 센다
+                q_count = a_count = 0
+                for img in qa.images:
+                    if img.region == 'question':
+                        q_count += 1
+                    elif img.region == 'answer':
+                        a_count += 1
+                out(f"문제 {qa.question_no}: Question {q_count}개, Answer {a_count}개 이미지")
             else:
-                print(f"문제 {qa.question_no}: {len(qa.images)}개 이미지")
+                out(f"문제 {qa.question_no}: {len(qa.images)}개 이미지")
         
         if len(image_questions) > 10:
-            print(f"... 외 {len(image_questions) - 10}개 문제")
+            out(f"... 외 {len(image_questions) - 10}개 문제")
     
     # 웹페이지 안내
-    print(f"\n=== 사용 안내 ===")
-    print("1. 웹페이지에서 cka_qa_data.json 파일을 업로드하세요")
-    if extraction_method == 'sequential':
-        print("2. 이미지가 JSON에 포함되어 있어 바로 사용 가능합니다")
+    out(f"\n=== 사용 안내 ===")
+    out("1. 웹페이지에서 cka_qa_data.json 파일을 업로드하세요")
+    if extraction_method == 'sequential' and args.binary_images:
+        out(f"2. {IMAGE_SIDECAR_FILE} 파일도 JSON과 같은 폴더에 두세요")
+    elif extraction_method == 'sequential':
+        out("2. 이미지가 JSON에 포함되어 있어 바로 사용 가능합니다")
     else:
-        print("2. extracted_images 폴더도 함께 업로드하세요")
-    print("3. Question과 Answer 영역에 따라 이미지가 분리되어 표시됩니다")
+        out("2. extracted_images 폴더도 함께 업로드하세요")
+    out("3. Question과 Answer 영역에 따라 이미지가 분리되어 표시됩니다")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """메인 함수"""
@@ -279,15 +450,20 @@ def main():
         print("필수 라이브러리를 설치한 후 다시 실행해주세요.")
         return
     
+    # 여러 PDF가 주어지면 프로세스 풀로 병렬 처리
+    if len(args.pdf_paths) > 1:
+        extraction_method = resolve_extraction_method(args)
+        if extraction_method:
+            process_batch(args.pdf_paths, extraction_method, args)
+        return
+    
     # PDF 파일 경로 확정
-    pdf_path = args.pdf_path
+    pdf_path = args.pdf_paths[0] if args.pdf_paths else None
     
     if not pdf_path:
         # 명령행에서 파일이 제공되지 않은 경우
-        default_files = ["CKA V13.95.pdf", "cka.pdf", "CKA.pdf"]
-        
         # 기본 파일명들 확인
-        for default_file in default_files:
+        for default_file in _DEFAULT_FILES:
             if os.path.exists(default_file):
                 pdf_path = default_file
                 print(f"기본 파일 사용: {pdf_path}")
@@ -300,45 +476,29 @@ def main():
                 return
     
     # PDF 파일 확인
-    if not check_pdf_file(pdf_path):
+    pdf_stat = check_pdf_file(pdf_path)
+    if pdf_stat is None:
         return
     
     if not args.quiet:
         print(f"\nPDF 파일: {pdf_path}")
-        display_file_info(pdf_path)
+        display_file_info(pdf_path, pdf_stat)
         print()
     
     try:
         # 추출 방식 결정
-        if args.sequential:
-            if not HAS_SEQUENTIAL:
-                print("오류: sequential_extractor.py 파일이 없습니다.")
-                print("순차적 추출을 사용하려면 sequential_extractor.py가 필요합니다.")
-                return
-            extraction_method = 'sequential'
-        elif args.simple:
-            extraction_method = 'simple'
-        elif args.enhanced:
-            extraction_method = 'enhanced'
-        else:
-            extraction_method = 'enhanced'  # 기본값
+        extraction_method = resolve_extraction_method(args)
+        if not extraction_method:
+            return
         
         if not args.quiet:
-            method_names = {
-                'sequential': "[SEQUENTIAL] 순차적 추출 방식 (텍스트-이미지 순서 보존, base64)",
-                'enhanced': "[ENHANCED] 개선된 추출 방식 (Question/Answer 이미지 분리)", 
-                'simple': "[SIMPLE] 기본 추출 방식 (기존 방식)"
-            }
-            print(method_names[extraction_method])
+            print(_METHOD_NAMES[extraction_method])
         
         # 추출 실행
         print("PDF에서 텍스트 및 이미지 추출 중...")
         
-        if extraction_method == 'sequential':
-            qa_pairs, stats = extract_cka_data_sequential(pdf_path)
-        else:
-            use_enhanced = (extraction_method == 'enhanced')
-            qa_pairs, stats = extract_cka_data(pdf_path, use_enhanced=use_enhanced)
+        # 페이지 병렬 처리는 프로세스 시작/문서 재오픈 비용이 있으므로 --jobs를 지정한 경우에만 사용
+        qa_pairs, stats = run_extraction(pdf_path, extraction_method, jobs=args.jobs or 1)
         
         if not qa_pairs:
             print("문제를 찾을 수 없습니다. PDF 형식을 확인해주세요.")
@@ -356,7 +516,8 @@ def main():
         print("\n문제 해결 방법:")
         print("1. PDF 파일이 손상되지 않았는지 확인")
         print("2. 필요한 라이브러리가 모두 설치되었는지 확인")
-        print("   pip install pdfplumber PyMuPDF PyPDF2")
+        print("   pip install PyMuPDF")
+        print("   (선택) pip install pypdfium2 pdfplumber PyPDF2  # PyMuPDF 실패 시 대체용")
         if args.sequential:
             print("3. 순차적 추출은 PyMuPDF가 필수입니다")
     
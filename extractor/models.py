@@ -2,16 +2,28 @@
 CKA PDF 추출기 - 데이터 모델 정의
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import List, Optional, Union
 from enum import Enum
 
+# base64 인코딩 가속 (선택적, pybase64는 SIMD 구현 사용)
+try:
+    from pybase64 import b64encode as _b64encode
+    HAS_PYBASE64 = True
+except ImportError:
+    from base64 import b64encode as _b64encode
+    HAS_PYBASE64 = False
+
+# Python 3.10 이상에서는 __slots__ 기반 dataclass 사용 (인스턴스 __dict__ 제거)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class ContentType(Enum):
     """콘텐츠 타입 정의"""
     TEXT = "text"
     IMAGE = "image"
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ImageInfo:
     """이미지 정보"""
     filename: str
@@ -20,7 +32,31 @@ class ImageInfo:
     height: int
     page_num: int
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
+class ImagePayload:
+    """JSON에 직접 포함되는 이미지 데이터 (순차적 추출 방식)"""
+    region: str  # 'question' 또는 'answer'
+    format: str
+    data: bytes  # 이미지 원본 바이트 (base64는 JSON 저장 시점에 인코딩)
+    width: int
+    height: int
+    
+    @property
+    def mime(self) -> str:
+        """이미지 MIME 타입"""
+        return f"image/{self.format}"
+    
+    def to_web_format(self) -> dict:
+        """웹페이지용 형태로 변환 (이 시점에 base64 인코딩)"""
+        return {
+            'type': self.region,
+            'base64': _b64encode(self.data).decode('ascii'),
+            'format': self.format,
+            'width': self.width,
+            'height': self.height
+        }
+
+@dataclass(frozen=True, **_SLOTS)
 class TextBlock:
     """텍스트 블록 정보"""
     content: str
@@ -28,7 +64,7 @@ class TextBlock:
     page_num: int
     font_size: Optional[float] = None
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ContentElement:
     """콘텐츠 요소 (텍스트 또는 이미지)"""
     type: ContentType
@@ -36,21 +72,21 @@ class ContentElement:
     position: float
     page_num: int
 
-@dataclass
+@dataclass(**_SLOTS)
 class QuestionAnswer:
     """질문-답변 쌍 (기본)"""
     question_no: int
     question: str
     answer: str
-    images: List[str] = None
-    has_images: bool = False
+    images: List[Union[str, ImagePayload]] = field(default_factory=list)
+    image_mode: str = 'file'  # 'file': 이미지 파일명, 'embedded': ImagePayload
     
-    def __post_init__(self):
-        if self.images is None:
-            self.images = []
-        self.has_images = len(self.images) > 0
+    @property
+    def has_images(self) -> bool:
+        """이미지 포함 여부 (접근할 때 계산)"""
+        return bool(self.images)
 
-@dataclass
+@dataclass(**_SLOTS)
 class StructuredQuestionAnswer:
     """구조화된 질문-답변 쌍 (텍스트와 이미지 순서 포함)"""
     question_no: int
@@ -59,27 +95,42 @@ class StructuredQuestionAnswer:
     raw_question: str
     raw_answer: str
     total_images: int = 0
+    question_image_count: int = 0
+    answer_image_count: int = 0
     
     def __post_init__(self):
-        # 이미지 개수 계산
-        question_images = sum(1 for elem in self.question_content if elem.type == ContentType.IMAGE)
-        answer_images = sum(1 for elem in self.answer_content if elem.type == ContentType.IMAGE)
+        # 이미지 개수 계산 (영역별로 한 번씩만 순회, enum은 싱글턴이므로 is 비교)
+        image_type = ContentType.IMAGE
+        question_images = 0
+        for elem in self.question_content:
+            if elem.type is image_type:
+                question_images += 1
+        answer_images = 0
+        for elem in self.answer_content:
+            if elem.type is image_type:
+                answer_images += 1
+        self.question_image_count = question_images
+        self.answer_image_count = answer_images
         self.total_images = question_images + answer_images
     
+    @property
+    def has_images(self) -> bool:
+        """이미지 포함 여부"""
+        return self.total_images > 0
+    
     def to_basic_qa(self) -> QuestionAnswer:
         """기본 QuestionAnswer 형태로 변환"""
         # 모든 이미지 파일명 추출
         all_images = []
         for elem in self.question_content + self.answer_content:
-            if elem.type == ContentType.IMAGE:
+            if elem.type is ContentType.IMAGE:
                 all_images.append(elem.content.filename)
         
         return QuestionAnswer(
             question_no=self.question_no,
             question=self.raw_question,
             answer=self.raw_answer,
-            images=all_images,
-            has_images=len(all_images) > 0
+            images=all_images
         )
     
     def to_web_format(self) -> dict:
@@ -87,7 +138,7 @@ class StructuredQuestionAnswer:
         def content_to_dict(content_list):
             result = []
             for elem in content_list:
-                if elem.type == ContentType.TEXT:
+                if elem.type is ContentType.TEXT:
                     result.append({
                         'type': 'text',
                         'content': elem.content,
@@ -110,8 +161,8 @@ class StructuredQuestionAnswer:
             'question_content': content_to_dict(self.question_content),
             'answer_content': content_to_dict(self.answer_content),
             'images': [elem.content.filename for elem in self.question_content + self.answer_content 
-                      if elem.type == ContentType.IMAGE],
-            'has_images': self.total_images > 0,
+                      if elem.type is ContentType.IMAGE],
+            'has_images': self.has_images,
             'total_images': self.total_images
         }
 
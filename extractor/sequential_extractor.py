@@ -4,12 +4,17 @@ PDF를 읽으면서 텍스트와 이미지를 순서대로 추출하여 하나
 """
 
 import os
+import io
+import sys
 import re
 import time
-import base64
-from typing import List, Dict, Tuple, Optional, Union
+import bisect
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Dict, Tuple, Optional, Union, Iterator, NamedTuple
 from dataclasses import dataclass
-from models import QuestionAnswer, ExtractionStats, PDFExtractionError
+from models import QuestionAnswer, ImagePayload, ExtractionStats, PDFExtractionError
 
 # PDF 처리 라이브러리 임포트
 try:
@@ -18,16 +23,57 @@ try:
 except ImportError:
     HAS_PYMUPDF = False
 
-@dataclass
+# 문제 경계/텍스트 정리 패턴 (모듈 로드 시 한 번만 컴파일)
+_RE_QUESTION_NO = re.compile(r'QUESTION NO:\s*(\d+)', re.IGNORECASE)
+_RE_ANSWER = re.compile(r'Answer:\s*', re.IGNORECASE)
+_RE_NOISE = re.compile(
+    r'IT Certification Guaranteed, The Easy Way!\s*\d*'
+    r'|Task Weight:\s*\d+%\s*'
+    r'|Score:\s*\d+%\s*'
+)
+_RE_QNO_STRIP = re.compile(r'QUESTION NO:\s*\d+\s*')
+_RE_ANSWER_TAIL = re.compile(r'\s*Answer:.*$', re.DOTALL)
+_RE_ANSWER_HEAD = re.compile(r'^.*?Answer:\s*', re.DOTALL)
+_RE_NEWLINES = re.compile(r'\n+')
+
+# 전체 텍스트에서 이미지 자리를 표시하는 고정 문자열 (U+FFFC 객체 대체 문자)
+# 경계 패턴이 이미지 앞뒤를 구분할 수 있도록 공백이 아닌 한 글자를 남긴다
+_IMAGE_MARKER = "\ufffc\n"
+
+# Python 3.10 이상에서는 __slots__ 기반 dataclass 사용 (인스턴스 __dict__ 제거)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 페이지 병렬 추출 시 프로세스 하나가 맡는 최소 페이지 수 (너무 잘게 나누면 문서 열기/피클링 비용이 더 큼)
+MIN_PAGES_PER_JOB = 8
+
+@dataclass(frozen=True, **_SLOTS)
+class ImageContent:
+    """이미지 요소의 내용 (원본 바이트와 표시 크기)"""
+    data: bytes
+    format: str
+    width: int
+    height: int
+    page: int  # 1부터 시작하는 페이지 번호
+    index: int  # 페이지 내 이미지 순서 (1부터)
+
+@dataclass(**_SLOTS)
 class ContentElement:
     """콘텐츠 요소 (텍스트 또는 이미지)"""
     type: str  # 'text' 또는 'image'
-    content: Union[str, Dict[str, str]]  # 텍스트 또는 이미지 데이터
+    content: Union[str, ImageContent]  # 텍스트 또는 이미지 데이터
     position: float  # 페이지 내 Y 좌표
     page_num: int
     element_index: int  # 페이지 내 요소 순서
 
-@dataclass  
+class _TextFragment(NamedTuple):
+    """Answer: 마커로 나뉜 텍스트 블록 조각 (ContentElement와 같은 속성 이름의 가벼운 튜플)"""
+    type: str  # 항상 'text'
+    content: str
+    position: float
+    page_num: int
+    element_index: int
+
+@dataclass(**_SLOTS)
 class QuestionAnswerStructured:
     """구조화된 질문-답변 쌍"""
     question_no: int
@@ -43,27 +89,55 @@ class SequentialExtractor:
         self.pdf_path = pdf_path
         if not HAS_PYMUPDF:
             raise PDFExtractionError("순차적 추출을 위해서는 PyMuPDF가 필요합니다.")
+        # 여러 페이지에 반복되는 이미지(로고 등)는 한 번만 읽고 같은 bytes 객체를 공유
+        self._xref_cache: Dict[int, Tuple[bytes, str, int, int]] = {}
     
-    def extract_sequential_content(self) -> List[ContentElement]:
-        """PDF를 페이지별로 읽어서 텍스트와 이미지를 순서대로 추출"""
-        all_elements = []
-        
+    def iter_page_elements(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[ContentElement]]:
+        """페이지를 하나씩 열어 읽기 순서로 정렬된 요소 목록을 생성 (처리한 페이지는 바로 해제)"""
+        doc = fitz.open(self.pdf_path)
         try:
-            doc = fitz.open(self.pdf_path)
-            
-            for page_num in range(doc.page_count):
+            if stop is None or stop > doc.page_count:
+                stop = doc.page_count
+            for page_num in range(start, stop):
                 print(f"페이지 {page_num + 1} 처리 중...")
-                page = doc[page_num]
+                page = doc.load_page(page_num)
                 
                 # 페이지의 모든 요소들 수집
-                page_elements = self._extract_page_elements(page, page_num)
+                page_elements = self._extract_page_elements(doc, page, page_num)
+                
+                # 페이지 객체(표시 목록, 이미지 버퍼 등)는 다음 페이지로 넘어가기 전에 해제
+                del page
                 
                 # 페이지 내에서 Y 좌표 순으로 정렬 (읽기 순서)
                 page_elements.sort(key=lambda x: (x.position, x.element_index))
                 
-                all_elements.extend(page_elements)
-            
+                yield page_elements
+        finally:
             doc.close()
+            self._xref_cache.clear()
+    
+    def extract_sequential_content(self, jobs: int = 1) -> List[ContentElement]:
+        """PDF를 페이지별로 읽어서 텍스트와 이미지를 순서대로 추출 (jobs > 1이면 페이지 구간별 프로세스 병렬 처리)"""
+        all_elements = []
+        
+        try:
+            if jobs > 1:
+                with fitz.open(self.pdf_path) as doc:
+                    page_count = doc.page_count
+                jobs = min(jobs, page_count // MIN_PAGES_PER_JOB)
+            
+            if jobs > 1:
+                # 문서 객체는 피클링되지 않으므로 각 프로세스가 연속된 페이지 구간을 직접 열어 처리
+                bounds = [page_count * i // jobs for i in range(jobs + 1)]
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    # map은 입력 순서대로 결과를 돌려주므로 페이지 순서가 유지됨
+                    for range_elements in executor.map(
+                            _extract_page_range, repeat(self.pdf_path), bounds[:-1], bounds[1:]):
+                        all_elements.extend(range_elements)
+            else:
+                for page_elements in self.iter_page_elements():
+                    all_elements.extend(page_elements)
+            
             print(f"총 {len(all_elements)}개 요소 추출 완료")
             
         except Exception as e:
@@ -71,8 +145,8 @@ class SequentialExtractor:
         
         return all_elements
     
-    def _extract_page_elements(self, page, page_num: int) -> List[ContentElement]:
-        """한 페이지에서 텍스트와 이미지 요소들을 추출"""
+    def _extract_page_elements(self, doc, page, page_num: int) -> List[ContentElement]:
+        """한 페이지에서 텍스트와 이미지 요소들을 추출 (doc은 page가 속한 열린 문서)"""
         elements = []
         element_index = 0
         
@@ -81,9 +155,16 @@ class SequentialExtractor:
         elements.extend(text_elements)
         element_index += len(text_elements)
         
-        # 2. 이미지들 추출
-        image_elements = self._extract_image_blocks(page, page_num, element_index)
-        elements.extend(image_elements)
+        # 2. 이미지들 추출 (이미지가 없는 텍스트 전용 페이지는 건너뜀)
+        try:
+            image_list = page.get_images()
+        except Exception as e:
+            print(f"페이지 {page_num + 1} 이미지 추출 오류: {e}")
+            return elements
+        
+        if image_list:
+            image_elements = self._extract_image_blocks(doc, page, page_num, element_index, image_list)
+            elements.extend(image_elements)
         
         return elements
     
@@ -92,76 +173,100 @@ class SequentialExtractor:
         text_elements = []
         
         try:
-            blocks = page.get_text("dict")["blocks"]
-            
-            for block_idx, block in enumerate(blocks):
-                if "lines" in block:  # 텍스트 블록
-                    # 블록의 모든 텍스트 수집
-                    block_text = ""
-                    for line in block["lines"]:
-                        line_text = ""
-                        for span in line["spans"]:
-                            line_text += span["text"]
-                        block_text += line_text.strip() + "\n"
-                    
-                    block_text = block_text.strip()
-                    
-                    if block_text:  # 빈 텍스트가 아닌 경우만
-                        element = ContentElement(
-                            type='text',
-                            content=block_text,
-                            position=block["bbox"][1],  # Y 좌표
-                            page_num=page_num,
-                            element_index=start_index + block_idx
-                        )
-                        text_elements.append(element)
+            # (x0, y0, x1, y1, 텍스트, 블록 번호, 블록 타입) 튜플 목록 (span 단위 dict를 만들지 않음)
+            for _, y0, _, _, text, block_no, block_type in page.get_text("blocks"):
+                if block_type != 0:  # 텍스트 블록만
+                    continue
+                
+                # 줄마다 앞뒤 공백 정리
+                block_text = "\n".join(line.strip() for line in text.splitlines()).strip()
+                
+                if block_text:  # 빈 텍스트가 아닌 경우만
+                    element = ContentElement(
+                        type='text',
+                        content=block_text,
+                        position=y0,  # Y 좌표
+                        page_num=page_num,
+                        element_index=start_index + block_no
+                    )
+                    text_elements.append(element)
         
         except Exception as e:
             print(f"페이지 {page_num + 1} 텍스트 추출 오류: {e}")
         
         return text_elements
     
-    def _extract_image_blocks(self, page, page_num: int, start_index: int) -> List[ContentElement]:
-        """페이지에서 이미지들을 추출하고 base64로 인코딩"""
+    def _read_image(self, doc, xref: int) -> Tuple[bytes, str, int, int]:
+        """doc에서 xref 이미지의 (데이터, 형식, 가로 픽셀, 세로 픽셀) 반환
+        
+        PDF에 PNG/JPEG 스트림으로 저장된 RGB·회색조 이미지는 원본 바이트를 그대로 쓰고,
+        CMYK 등 브라우저가 바로 표시할 수 없는 경우에만 Pixmap으로 디코딩해 PNG로 다시 인코딩한다.
+        같은 xref는 캐시된 결과를 재사용한다.
+        """
+        cached = self._xref_cache.get(xref)
+        if cached is not None:
+            return cached
+        
+        info = doc.extract_image(xref)
+        if info and info['ext'] in ('png', 'jpeg', 'jpg') and info['colorspace'] < 4:
+            img_format = 'jpeg' if info['ext'] == 'jpg' else info['ext']
+            result = (info['image'], img_format, info['width'], info['height'])
+        else:
+            pix = fitz.Pixmap(doc, xref)
+            
+            # CMYK를 RGB로 변환
+            if pix.colorspace and pix.colorspace.n >= 4:
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            
+            result = (pix.tobytes("png"), 'png', pix.width, pix.height)
+        
+        self._xref_cache[xref] = result
+        return result
+    
+    def _extract_image_blocks(self, doc, page, page_num: int, start_index: int,
+                              image_list: Optional[list] = None) -> List[ContentElement]:
+        """페이지에서 이미지 데이터를 추출 (base64 인코딩은 저장 시점에 수행)"""
         image_elements = []
         
         try:
-            image_list = page.get_images(full=True)
+            # 호출하는 쪽에서 이미 조회한 이미지 목록이 있으면 재사용
+            if image_list is None:
+                image_list = page.get_images()
+            if not image_list:
+                return image_elements
+            
+            # 페이지 내 이미지 위치를 한 번에 수집 (xref별 첫 번째 표시 위치)
+            # get_image_rects는 이미지마다 Pixmap을 디코딩해 해시를 비교하므로 사용하지 않음
+            bbox_map = {}
+            for info in page.get_image_info(xrefs=True):
+                bbox_map.setdefault(info['xref'], info['bbox'])
             
             for img_idx, img in enumerate(image_list):
                 try:
                     # 이미지 데이터 추출
                     xref = img[0]
-                    pix = fitz.Pixmap(page.parent, xref)
-                    
-                    # CMYK를 RGB로 변환
-                    if pix.n - pix.alpha >= 4:
-                        pix = fitz.Pixmap(fitz.csRGB, pix)
-                    
-                    # base64로 인코딩
-                    img_data = pix.tobytes("png")
-                    img_base64 = base64.b64encode(img_data).decode('utf-8')
+                    img_data, img_format, pixel_width, pixel_height = self._read_image(doc, xref)
                     
                     # 이미지 위치 정보
-                    img_rects = page.get_image_rects(xref)
-                    if img_rects:
-                        y_position = img_rects[0][1]
-                        width = int(img_rects[0][2] - img_rects[0][0])
-                        height = int(img_rects[0][3] - img_rects[0][1])
+                    bbox = bbox_map.get(xref)
+                    if bbox:
+                        y_position = bbox[1]
+                        width = int(bbox[2] - bbox[0])
+                        height = int(bbox[3] - bbox[1])
                     else:
                         y_position = 0
-                        width = pix.width
-                        height = pix.height
+                        width = pixel_width
+                        height = pixel_height
                     
                     # 이미지 메타데이터
-                    image_data = {
-                        'base64': img_base64,
-                        'format': 'png',
-                        'width': width,
-                        'height': height,
-                        'page': page_num + 1,
-                        'index': img_idx + 1
-                    }
+                    image_data = ImageContent(
+                        data=img_data,
+                        format=img_format,
+                        width=width,
+                        height=height,
+                        page=page_num + 1,
+                        index=img_idx + 1
+                    )
                     
                     element = ContentElement(
                         type='image',
@@ -172,7 +277,6 @@ class SequentialExtractor:
                     )
                     
                     image_elements.append(element)
-                    pix = None
                     
                 except Exception as e:
                     print(f"페이지 {page_num + 1}, 이미지 {img_idx + 1} 처리 실패: {e}")
@@ -188,16 +292,21 @@ class SequentialExtractor:
         qa_pairs = []
         
         # 전체 텍스트를 재구성하여 문제 경계 찾기
-        full_text = ""
+        text_parts = []
         element_positions = []  # 각 요소가 전체 텍스트에서 시작하는 위치
+        offset = 0
         
         for element in elements:
             if element.type == 'text':
-                element_positions.append((len(full_text), element))
-                full_text += element.content + "\n"
+                piece = element.content + "\n"
             else:  # image
-                element_positions.append((len(full_text), element))
-                full_text += f"[IMAGE_{element.page_num}_{element.element_index}]\n"
+                piece = _IMAGE_MARKER
+            element_positions.append((offset, element))
+            text_parts.append(piece)
+            offset += len(piece)
+        
+        full_text = "".join(text_parts)
+        text_offsets = [pos for pos, _ in element_positions]  # 오름차순 (이분 탐색용)
         
         # QUESTION NO: 패턴으로 문제 경계 찾기
         question_boundaries = self._find_question_boundaries(full_text)
@@ -205,8 +314,11 @@ class SequentialExtractor:
         # 각 문제별로 요소들 분류
         for question_no, boundaries in question_boundaries.items():
             try:
+                # 문제 영역 [question_start, answer_end)에 시작하는 요소만 골라 분류
+                lo = bisect.bisect_left(text_offsets, boundaries['question_start'])
+                hi = bisect.bisect_left(text_offsets, boundaries['answer_end'])
                 question_elements, answer_elements = self._classify_elements_by_boundaries(
-                    element_positions, boundaries
+                    element_positions[lo:hi], boundaries
                 )
                 
                 # 원시 텍스트 추출
@@ -224,8 +336,8 @@ class SequentialExtractor:
                 qa_pairs.append(qa_structured)
                 
                 # 간단한 진행 상황만 출력
-                q_images = len([e for e in question_elements if e.type == 'image'])
-                a_images = len([e for e in answer_elements if e.type == 'image'])
+                q_images = sum(1 for e in question_elements if e.type == 'image')
+                a_images = sum(1 for e in answer_elements if e.type == 'image')
                 if (q_images + a_images) > 0:
                     print(f"문제 {question_no}: Question {q_images}개, Answer {a_images}개 이미지")
                 
@@ -240,7 +352,7 @@ class SequentialExtractor:
         boundaries = {}
         
         # QUESTION NO: 패턴 찾기
-        question_matches = list(re.finditer(r'QUESTION NO:\s*(\d+)', full_text, re.IGNORECASE))
+        question_matches = list(_RE_QUESTION_NO.finditer(full_text))
         for i, match in enumerate(question_matches):
             question_no = int(match.group(1))
             question_start = match.start()
@@ -253,7 +365,7 @@ class SequentialExtractor:
             
             # 해당 문제 영역에서 Answer: 찾기
             question_text = full_text[question_start:question_end]
-            answer_match = re.search(r'Answer:\s*', question_text, re.IGNORECASE)
+            answer_match = _RE_ANSWER.search(question_text)
             
             if answer_match:
                 # Answer: 텍스트의 끝부분부터 실제 답변 시작
@@ -277,7 +389,7 @@ class SequentialExtractor:
     
     def _classify_elements_by_boundaries(self, element_positions: List[Tuple[int, ContentElement]], 
                                        boundaries: Dict[str, int]) -> Tuple[List[ContentElement], List[ContentElement]]:
-        """경계 정보를 바탕으로 요소들을 Question/Answer로 분류"""
+        """경계 정보를 바탕으로 요소들을 Question/Answer로 분류 (Answer: 마커로 나뉜 블록은 _TextFragment로 담김)"""
         question_elements = []
         answer_elements = []
         
@@ -296,7 +408,7 @@ class SequentialExtractor:
             else:
                 # 텍스트의 경우 Answer: 마커로 분할 필요 여부 확인
                 element_content = element.content
-                answer_match = re.search(r'Answer:\s*', element_content, re.IGNORECASE)
+                answer_match = _RE_ANSWER.search(element_content)
                 
                 if answer_match and question_start <= text_pos < answer_end:
                     # Answer: 마커가 포함된 텍스트 블록을 분할
@@ -305,25 +417,17 @@ class SequentialExtractor:
                     
                     # Question 부분
                     if question_part:
-                        question_element = ContentElement(
-                            type='text',
-                            content=question_part,
-                            position=element.position,
-                            page_num=element.page_num,
-                            element_index=element.element_index
-                        )
-                        question_elements.append(question_element)
+                        question_elements.append(_TextFragment(
+                            'text', question_part, element.position,
+                            element.page_num, element.element_index
+                        ))
                     
                     # Answer 부분
                     if answer_part:
-                        answer_element = ContentElement(
-                            type='text',
-                            content=answer_part,
-                            position=element.position + answer_match.end(),
-                            page_num=element.page_num,
-                            element_index=element.element_index + 1
-                        )
-                        answer_elements.append(answer_element)
+                        answer_elements.append(_TextFragment(
+                            'text', answer_part, element.position + answer_match.end(),
+                            element.page_num, element.element_index + 1
+                        ))
                 else:
                     # Answer: 마커가 없는 경우 기존 로직대로
                     if question_start <= text_pos < question_end:
@@ -335,27 +439,21 @@ class SequentialExtractor:
     
     def _extract_raw_text(self, elements: List[ContentElement], is_question: bool = True) -> str:
         """요소들에서 텍스트만 추출"""
-        text_parts = []
-        for element in elements:
-            if element.type == 'text':
-                text_parts.append(element.content)
-        
-        raw_text = "\n".join(text_parts).strip()
+        # 앞뒤 공백은 마지막 strip에서 한 번만 정리 (중간 패턴들은 앞뒤 공백에 영향받지 않음)
+        raw_text = "\n".join([element.content for element in elements if element.type == 'text'])
         
-        # 공통 텍스트 정리
-        raw_text = re.sub(r'IT Certification Guaranteed, The Easy Way!\s*\d*', '', raw_text)
-        raw_text = re.sub(r'Task Weight:\s*\d+%\s*', '', raw_text)
-        raw_text = re.sub(r'Score:\s*\d+%\s*', '', raw_text)
+        # 공통 텍스트 정리 (한 번의 스캔으로 제거)
+        raw_text = _RE_NOISE.sub('', raw_text)
         
         if is_question:
             # Question 영역: QUESTION NO: 제거, Answer: 및 그 이후 내용 제거
-            raw_text = re.sub(r'QUESTION NO:\s*\d+\s*', '', raw_text)
-            raw_text = re.sub(r'\s*Answer:.*$', '', raw_text, flags=re.DOTALL)
+            raw_text = _RE_QNO_STRIP.sub('', raw_text)
+            raw_text = _RE_ANSWER_TAIL.sub('', raw_text)
         else:
             # Answer 영역: Answer: 마커와 그 이전 모든 내용 제거
-            raw_text = re.sub(r'^.*?Answer:\s*', '', raw_text, flags=re.DOTALL)
+            raw_text = _RE_ANSWER_HEAD.sub('', raw_text)
         
-        raw_text = re.sub(r'\n+', '\n', raw_text)
+        raw_text = _RE_NEWLINES.sub('\n', raw_text)
         cleaned_text = raw_text.strip()
         
         return cleaned_text if cleaned_text else "[내용이 제공되지 않음]"
@@ -365,52 +463,63 @@ class SequentialExtractor:
         basic_pairs = []
         
         for structured in structured_pairs:
-            # 이미지 데이터 준비 (base64 형태로)
+            # 이미지 데이터 준비 (원본 바이트)
             all_images = []
             
             # Question 이미지들
             for element in structured.question_elements:
                 if element.type == 'image':
-                    image_info = {
-                        'type': 'question',
-                        'base64': element.content['base64'],
-                        'format': element.content['format'],
-                        'width': element.content['width'],
-                        'height': element.content['height']
-                    }
-                    all_images.append(image_info)
+                    image = element.content
+                    all_images.append(ImagePayload(
+                        region='question',
+                        format=image.format,
+                        data=image.data,
+                        width=image.width,
+                        height=image.height
+                    ))
             
             # Answer 이미지들  
             for element in structured.answer_elements:
                 if element.type == 'image':
-                    image_info = {
-                        'type': 'answer',
-                        'base64': element.content['base64'],
-                        'format': element.content['format'],
-                        'width': element.content['width'],
-                        'height': element.content['height']
-                    }
-                    all_images.append(image_info)
+                    image = element.content
+                    all_images.append(ImagePayload(
+                        region='answer',
+                        format=image.format,
+                        data=image.data,
+                        width=image.width,
+                        height=image.height
+                    ))
             
             # QuestionAnswer 객체 생성
             basic_qa = QuestionAnswer(
                 question_no=structured.question_no,
                 question=structured.raw_question_text,
                 answer=structured.raw_answer_text,
-                images=all_images,  # base64 데이터로 직접 설정
-                has_images=len(all_images) > 0
+                images=all_images,  # 이미지 데이터를 직접 설정
+                image_mode='embedded'
             )
             
             basic_pairs.append(basic_qa)
         
         return basic_pairs
 
-def extract_cka_data_sequential(pdf_path: str) -> Tuple[List[QuestionAnswer], ExtractionStats]:
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[ContentElement]:
+    """작업 프로세스에서 [start, stop) 페이지 구간의 요소를 추출"""
+    extractor = SequentialExtractor(pdf_path)
+    elements = []
+    # 여러 프로세스의 페이지별 진행 로그가 섞이지 않도록 작업 중 출력은 버린다
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page_elements in extractor.iter_page_elements(start, stop):
+            elements.extend(page_elements)
+    return elements
+
+def extract_cka_data_sequential(pdf_path: str, jobs: int = 1) -> Tuple[List[QuestionAnswer], ExtractionStats]:
     """
     순차적 방식으로 CKA PDF 데이터 추출
     
     Args:
         pdf_path: PDF 파일 경로
+        jobs: 페이지 추출에 사용할 프로세스 수 (1이면 현재 프로세스에서 순차 처리)
     
     Returns:
         (질문답변_리스트, 통계정보)
@@ -423,7 +532,7 @@ def extract_cka_data_sequential(pdf_path: str) -> Tuple[List[QuestionAnswer], Ex
         extractor = SequentialExtractor(pdf_path)
         
         # 1단계: 순차적 콘텐츠 추출
-        elements = extractor.extract_sequential_content()
+        elements = extractor.extract_sequential_content(jobs)
         
         # 2단계: Question-Answer 파싱
         structured_pairs = extractor.parse_qa_from_sequential_content(elements)
@@ -6,14 +6,48 @@ import re
 import os
 import json
 import csv
-from typing import List, Dict, Any, Optional
+import contextlib
+import importlib.util
+from typing import List, Dict, Any, Optional, Iterable
 from models import QuestionAnswer, StructuredQuestionAnswer, ExtractionStats
 
+# JSON 직렬화 가속 (선택적)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 문제/답변 마커 패턴 (모듈 로드 시 한 번만 컴파일)
+_RE_QUESTION_NO = re.compile(r'QUESTION NO:\s*(\d+)', re.IGNORECASE)
+_RE_QUESTION_SPLIT = re.compile(r'(QUESTION NO:\s*\d+)', re.IGNORECASE)
+_RE_ANSWER = re.compile(r'Answer:\s*', re.IGNORECASE)
+_RE_NEXT_QUESTION_TAIL = re.compile(r'\s*QUESTION NO:\s*\d+.*$', re.DOTALL | re.IGNORECASE)
+
+# 질문/답변 정리 패턴: 위치와 무관한 패턴들은 하나의 alternation으로 묶어 한 번의 스캔으로 제거
+# (같은 위치에서는 앞에 나열된 패턴이 우선). 줄 시작(^)에 묶인 패턴은 앞선 제거로
+# 줄이 합쳐진 결과에 적용되어야 하므로 따로 한 번 더 적용한다.
+_RE_QUESTION_NOISE = re.compile('|'.join((
+    r'IT Certification Guaranteed, The Easy Way!\s*\d*',
+    r'Task Weight:\s*\d+%\s*',
+    r'Task\s*',
+    r'Score:\s*\d+%\s*',
+    r'Context\s*'
+)), re.IGNORECASE)
+_RE_QUESTION_ANSWER_LINE = re.compile(r'^\s*Answer:\s*.*$', re.MULTILINE | re.IGNORECASE)  # Answer: 이후 모든 내용 제거
+_RE_CERT_NOISE = re.compile(r'IT Certification Guaranteed, The Easy Way!\s*\d*', re.IGNORECASE)
+_RE_SOLUTION_LINE = re.compile(r'^Solution:\s*|^solution\s*$', re.MULTILINE | re.IGNORECASE)
+_RE_BLANK_LINES = re.compile(r'\n\s*\n')
+_RE_SPACES = re.compile(r'[ \t]+')
+
 def create_output_directory(dir_name: str = "extracted_images") -> str:
     """출력 디렉토리 생성"""
-    if not os.path.exists(dir_name):
+    # 존재 여부를 따로 확인하지 않고 바로 생성 시도 (이미 있으면 그대로 사용)
+    try:
         os.makedirs(dir_name)
-        print(f"디렉토리 생성: {dir_name}")
+    except FileExistsError:
+        return dir_name
+    print(f"디렉토리 생성: {dir_name}")
     return dir_name
 
 def clean_question_text(text: str) -> str:
@@ -22,21 +56,12 @@ def clean_question_text(text: str) -> str:
         return ""
     
     # 불필요한 텍스트 제거
-    patterns_to_remove = [
-        r'IT Certification Guaranteed, The Easy Way!\s*\d*',
-        r'Task Weight:\s*\d+%\s*',
-        r'Task\s*',
-        r'Score:\s*\d+%\s*',
-        r'Context\s*',
-        r'^\s*Answer:\s*.*$'  # Answer: 이후 모든 내용 제거
-    ]
-    
-    for pattern in patterns_to_remove:
-        text = re.sub(pattern, '', text, flags=re.MULTILINE | re.IGNORECASE)
+    text = _RE_QUESTION_NOISE.sub('', text)
+    text = _RE_QUESTION_ANSWER_LINE.sub('', text)
     
     # 여러 줄바꿈을 정리
-    text = re.sub(r'\n\s*\n', '\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)  # 여러 공백을 하나로
+    text = _RE_BLANK_LINES.sub('\n', text)
+    text = _RE_SPACES.sub(' ', text)  # 여러 공백을 하나로
     
     return text.strip()
 
@@ -46,18 +71,12 @@ def clean_answer_text(text: str) -> str:
         return "[답변이 제공되지 않음]"
     
     # 불필요한 텍스트 제거
-    patterns_to_remove = [
-        r'IT Certification Guaranteed, The Easy Way!\s*\d*',
-        r'^Solution:\s*',
-        r'^solution\s*$'
-    ]
-    
-    for pattern in patterns_to_remove:
-        text = re.sub(pattern, '', text, flags=re.MULTILINE | re.IGNORECASE)
+    text = _RE_CERT_NOISE.sub('', text)
+    text = _RE_SOLUTION_LINE.sub('', text)
     
     # 여러 줄바꿈을 정리
-    text = re.sub(r'\n\s*\n', '\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _RE_BLANK_LINES.sub('\n', text)
+    text = _RE_SPACES.sub(' ', text)
     text = text.strip()
     
     # 빈 답변 처리
@@ -68,21 +87,20 @@ def clean_answer_text(text: str) -> str:
 
 def extract_question_numbers_from_text(text: str) -> List[int]:
     """텍스트에서 모든 문제 번호 추출"""
-    pattern = r'QUESTION NO:\s*(\d+)'
-    matches = re.findall(pattern, text, re.IGNORECASE)
+    matches = _RE_QUESTION_NO.findall(text)
     return [int(match) for match in matches]
 
 def split_text_by_questions(text: str) -> Dict[int, str]:
     """텍스트를 문제별로 분할"""
     # QUESTION NO:를 기준으로 분할
-    sections = re.split(r'(QUESTION NO:\s*\d+)', text, flags=re.IGNORECASE)
+    sections = _RE_QUESTION_SPLIT.split(text)
     
     question_texts = {}
     current_question_no = None
     
     for i, section in enumerate(sections):
         # QUESTION NO: 패턴 확인
-        question_match = re.match(r'QUESTION NO:\s*(\d+)', section, re.IGNORECASE)
+        question_match = _RE_QUESTION_NO.match(section)
         
         if question_match:
             current_question_no = int(question_match.group(1))
@@ -95,15 +113,14 @@ def split_text_by_questions(text: str) -> Dict[int, str]:
 def separate_question_and_answer(content: str) -> tuple[str, str]:
     """문제 내용에서 질문과 답변을 분리"""
     # Answer:를 기준으로 분리
-    answer_split = re.split(r'Answer:\s*', content, 1, flags=re.IGNORECASE)
+    answer_split = _RE_ANSWER.split(content, 1)
     
     if len(answer_split) == 2:
         question_text = answer_split[0].strip()
         answer_text = answer_split[1].strip()
         
         # 다음 질문이 포함되어 있으면 제거
-        answer_text = re.sub(r'\s*QUESTION NO:\s*\d+.*$', '', answer_text, 
-                           flags=re.DOTALL | re.IGNORECASE)
+        answer_text = _RE_NEXT_QUESTION_TAIL.sub('', answer_text)
         
         return clean_question_text(question_text), clean_answer_text(answer_text)
     else:
@@ -124,117 +141,153 @@ def calculate_statistics(qa_pairs: List[QuestionAnswer]) -> ExtractionStats:
     
     return stats
 
+def merge_statistics(stats_list: List[ExtractionStats]) -> ExtractionStats:
+    """여러 PDF의 통계 정보를 하나로 합산"""
+    merged = ExtractionStats()
+    for stats in stats_list:
+        merged.total_questions += stats.total_questions
+        merged.questions_with_answers += stats.questions_with_answers
+        merged.questions_with_images += stats.questions_with_images
+        merged.total_images += stats.total_images
+        merged.processing_time += stats.processing_time
+    return merged
+
+_QUESTIONS_HEADER = "CKA 시험 문제 모음\n" + "=" * 50 + "\n\n"
+_ANSWERS_HEADER = "CKA 시험 답변 모음\n" + "=" * 50 + "\n\n"
+_COMBINED_HEADER = "CKA (Certified Kubernetes Administrator) 시험 문제집\n" + "=" * 70 + "\n\n"
+
+def _image_summary(qa: QuestionAnswer) -> str:
+    """텍스트 파일에 표시할 이미지 정보 (이미지가 없으면 빈 문자열)"""
+    if not qa.has_images:
+        return ""
+    # Sequential 방식 호환을 위한 이미지 정보 표시
+    if qa.image_mode == 'embedded':
+        return f"{len(qa.images)}개 (base64 인코딩)"
+    return ', '.join(qa.images)
+
+def _question_entry(qa: QuestionAnswer, image_summary: str) -> str:
+    """질문 파일의 문제 하나 분량 텍스트"""
+    image_line = f"[이미지 포함: {image_summary}]\n" if image_summary else ""
+    return f"문제 {qa.question_no}:\n{qa.question}\n{image_line}\n" + "-" * 50 + "\n\n"
+
+def _answer_entry(qa: QuestionAnswer, image_summary: str) -> str:
+    """답변 파일의 문제 하나 분량 텍스트"""
+    image_line = f"[관련 이미지: {image_summary}]\n" if image_summary else ""
+    return f"문제 {qa.question_no} 답변:\n{qa.answer}\n{image_line}\n" + "-" * 50 + "\n\n"
+
+def _combined_entry(qa: QuestionAnswer, image_summary: str) -> str:
+    """질문+답변 파일의 문제 하나 분량 텍스트"""
+    image_line = f"[포함된 이미지: {image_summary}]\n" if image_summary else ""
+    return f"문제 {qa.question_no}:\n{qa.question}\n{image_line}\n답변:\n{qa.answer}\n\n" + "=" * 70 + "\n\n"
+
 def save_questions_only(qa_pairs: List[QuestionAnswer], filename: str = "cka_questions_only.txt"):
     """질문만 저장"""
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write("CKA 시험 문제 모음\n")
-        f.write("=" * 50 + "\n\n")
-        
-        for qa in qa_pairs:
-            f.write(f"문제 {qa.question_no}:\n")
-            f.write(f"{qa.question}\n")
-            if qa.has_images:
-                # Sequential 방식 호환을 위한 이미지 정보 표시
-                if qa.images and isinstance(qa.images[0], dict):
-                    img_count = len(qa.images)
-                    f.write(f"[이미지 포함: {img_count}개 (base64 인코딩)]\n")
-                else:
-                    f.write(f"[이미지 포함: {', '.join(qa.images)}]\n")
-            f.write("\n" + "-" * 50 + "\n\n")
+        f.write(_QUESTIONS_HEADER)
+        f.writelines(_question_entry(qa, _image_summary(qa)) for qa in qa_pairs)
 
 def save_answers_only(qa_pairs: List[QuestionAnswer], filename: str = "cka_answers_only.txt"):
     """답변만 저장"""
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write("CKA 시험 답변 모음\n")
-        f.write("=" * 50 + "\n\n")
-        
-        for qa in qa_pairs:
-            f.write(f"문제 {qa.question_no} 답변:\n")
-            f.write(f"{qa.answer}\n")
-            if qa.has_images:
-                # Sequential 방식 호환을 위한 이미지 정보 표시
-                if qa.images and isinstance(qa.images[0], dict):
-                    img_count = len(qa.images)
-                    f.write(f"[관련 이미지: {img_count}개 (base64 인코딩)]\n")
-                else:
-                    f.write(f"[관련 이미지: {', '.join(qa.images)}]\n")
-            f.write("\n" + "-" * 50 + "\n\n")
+        f.write(_ANSWERS_HEADER)
+        f.writelines(_answer_entry(qa, _image_summary(qa)) for qa in qa_pairs)
 
 def save_combined_qa(qa_pairs: List[QuestionAnswer], filename: str = "cka_questions_answers.txt"):
     """질문과 답변을 함께 저장"""
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write("CKA (Certified Kubernetes Administrator) 시험 문제집\n")
-        f.write("=" * 70 + "\n\n")
-        
+        f.write(_COMBINED_HEADER)
+        f.writelines(_combined_entry(qa, _image_summary(qa)) for qa in qa_pairs)
+
+def save_text_outputs(qa_pairs: List[QuestionAnswer],
+                      questions_file: str = "cka_questions_only.txt",
+                      answers_file: str = "cka_answers_only.txt",
+                      combined_file: str = "cka_questions_answers.txt"):
+    """질문/답변/결합 텍스트 파일 세 개를 한 번의 순회로 저장"""
+    with contextlib.ExitStack() as stack:
+        # 파일마다 1MB 버퍼를 두어 write 시스템 호출 횟수를 줄임
+        questions_out, answers_out, combined_out = (
+            stack.enter_context(open(filename, 'w', encoding='utf-8', buffering=1 << 20))
+            for filename in (questions_file, answers_file, combined_file)
+        )
+        questions_out.write(_QUESTIONS_HEADER)
+        answers_out.write(_ANSWERS_HEADER)
+        combined_out.write(_COMBINED_HEADER)
+        # 항목을 만들자마자 버퍼에 기록 (전체 내용을 메모리에 모으지 않음)
         for qa in qa_pairs:
-            f.write(f"문제 {qa.question_no}:\n")
-            f.write(f"{qa.question}\n")
-            if qa.has_images:
-                # Sequential 방식 호환을 위한 이미지 정보 표시
-                if qa.images and isinstance(qa.images[0], dict):
-                    img_count = len(qa.images)
-                    f.write(f"[포함된 이미지: {img_count}개 (base64 인코딩)]\n")
-                else:
-                    f.write(f"[포함된 이미지: {', '.join(qa.images)}]\n")
-            f.write(f"\n답변:\n{qa.answer}\n\n")
-            f.write("=" * 70 + "\n\n")
-
-def save_as_json(data: List[Dict[str, Any]], filename: str = "cka_qa_data.json"):
-    """JSON 형태로 저장"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+            image_summary = _image_summary(qa)
+            questions_out.write(_question_entry(qa, image_summary))
+            answers_out.write(_answer_entry(qa, image_summary))
+            combined_out.write(_combined_entry(qa, image_summary))
+
+def _dump_json_record(record: Dict[str, Any]) -> bytes:
+    """레코드 하나를 indent=2 JSON(UTF-8)으로 직렬화"""
+    if HAS_ORJSON:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode('utf-8')
+
+def save_as_json(records: Iterable[Dict[str, Any]], filename: str = "cka_qa_data.json"):
+    """JSON 배열 형태로 저장 (레코드를 하나씩 직렬화하여 바로 기록)"""
+    # json.dump(indent=2)와 같은 모양이 되도록 배열 요소를 한 단계 들여쓴다
+    # (JSON 문자열 안의 줄바꿈은 이스케이프되므로 실제 줄바꿈은 구조에만 있음)
+    with open(filename, 'wb') as f:
+        f.write(b"[")
+        first = True
+        for record in records:
+            f.write(b"\n  " if first else b",\n  ")
+            f.write(_dump_json_record(record).replace(b"\n", b"\n  "))
+            first = False
+        f.write(b"]" if first else b"\n]")
+
+def _csv_image_column(qa: QuestionAnswer) -> str:
+    """CSV images 열 값 (임베디드 이미지는 데이터 대신 개수만 기록)"""
+    if not qa.images:
+        return ''
+    if qa.image_mode == 'embedded':
+        return f"{len(qa.images)}개 (base64)"
+    return ', '.join(qa.images)
 
 def save_as_csv(qa_pairs: List[QuestionAnswer], filename: str = "cka_qa_data.csv"):
-    """CSV 형태로 저장"""
-    with open(filename, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['question_no', 'question', 'answer', 'images', 'has_images'])
-        writer.writeheader()
-        
-        for qa in qa_pairs:
-            writer.writerow({
-                'question_no': qa.question_no,
-                'question': qa.question,
-                'answer': qa.answer,
-                'images': str(len(qa.images)) + '개 (base64)' if qa.images and isinstance(qa.images[0], dict) else (', '.join(qa.images) if qa.images else ''),
-                'has_images': qa.has_images
-            })
+    """CSV 형태로 저장 (행 튜플을 생성기로 만들어 C 구현 csv.writer에 한 번에 전달)"""
+    with open(filename, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(('question_no', 'question', 'answer', 'images', 'has_images'))
+        writer.writerows(
+            (qa.question_no, qa.question, qa.answer, _csv_image_column(qa), qa.has_images)
+            for qa in qa_pairs
+        )
 
-def validate_pdf_path(pdf_path: str) -> str:
-    """PDF 파일 경로 검증"""
+def stat_pdf_path(pdf_path: str) -> os.stat_result:
+    """PDF 파일 경로 검증 후 stat 결과 반환 (os.stat 한 번으로 존재 확인과 파일 정보 조회)"""
     if not pdf_path:
         raise ValueError("PDF 파일 경로가 제공되지 않았습니다.")
     
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+    try:
+        stat_result = os.stat(pdf_path)
+    except OSError:
+        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}") from None
     
     if not pdf_path.lower().endswith('.pdf'):
         raise ValueError(f"PDF 파일이 아닙니다: {pdf_path}")
     
+    return stat_result
+
+def validate_pdf_path(pdf_path: str) -> str:
+    """PDF 파일 경로 검증"""
+    stat_pdf_path(pdf_path)
     return pdf_path
 
+# check_dependencies 결과 키 → 임포트 모듈 이름
+_DEPENDENCY_MODULES = {
+    'pdfplumber': 'pdfplumber',
+    'pymupdf': 'fitz',  # PyMuPDF
+    'pypdf2': 'PyPDF2',
+    'pypdfium2': 'pypdfium2',
+}
+
 def check_dependencies() -> Dict[str, bool]:
-    """필요한 라이브러리 설치 여부 확인"""
-    dependencies = {}
-    
-    try:
-        import pdfplumber
-        dependencies['pdfplumber'] = True
-    except ImportError:
-        dependencies['pdfplumber'] = False
-    
-    try:
-        import fitz  # PyMuPDF
-        dependencies['pymupdf'] = True
-    except ImportError:
-        dependencies['pymupdf'] = False
-    
-    try:
-        import PyPDF2
-        dependencies['pypdf2'] = True
-    except ImportError:
-        dependencies['pypdf2'] = False
-    
-    return dependencies
+    """필요한 라이브러리 설치 여부 확인 (모듈을 실제로 임포트하지 않고 find_spec으로 탐색만 함)"""
+    return {key: importlib.util.find_spec(module) is not None
+            for key, module in _DEPENDENCY_MODULES.items()}
 
 def print_dependency_status():
     """의존성 상태 출력"""
@@ -242,23 +295,28 @@ def print_dependency_status():
     
     deps = check_dependencies()
     
-    if deps.get('pdfplumber'):
-        print("[O] pdfplumber 설치됨 (권장)")
+    if deps.get('pymupdf'):
+        print("[O] PyMuPDF 설치됨 (권장, 기본 추출 엔진)")
     else:
-        print("[X] pdfplumber 미설치 - pip install pdfplumber")
+        print("[X] PyMuPDF 미설치 - pip install PyMuPDF (권장, 이미지 추출에 필요)")
     
-    if deps.get('pymupdf'):
-        print("[O] PyMuPDF 설치됨 (이미지 추출에 필요)")
+    if deps.get('pypdfium2'):
+        print("[O] pypdfium2 설치됨 (대체용, 빠른 텍스트 추출)")
+    else:
+        print("[X] pypdfium2 미설치 - pip install pypdfium2 (선택)")
+    
+    if deps.get('pdfplumber'):
+        print("[O] pdfplumber 설치됨 (대체용)")
     else:
-        print("[X] PyMuPDF 미설치 - pip install PyMuPDF (이미지 추출에 필요)")
+        print("[X] pdfplumber 미설치 - pip install pdfplumber (선택)")
     
     if deps.get('pypdf2'):
-        print("[O] PyPDF2 설치됨")
+        print("[O] PyPDF2 설치됨 (대체용)")
     else:
-        print("[X] PyPDF2 미설치 - pip install PyPDF2")
+        print("[X] PyPDF2 미설치 - pip install PyPDF2 (선택)")
     
     if not deps.get('pymupdf'):
-        print("\n경고: 이미지 추출 기능을 사용하려면 PyMuPDF가 필요합니다!")
+        print("\n경고: PyMuPDF가 없어 느린 대체 라이브러리로 텍스트를 추출하며, 이미지 추출은 불가능합니다!")
         print("설치 명령: pip install PyMuPDF")
     
     if not any(deps.values()):
@@ -276,12 +334,15 @@ def format_file_size(size_bytes: int) -> str:
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
 
-def get_file_info(filepath: str) -> Dict[str, Any]:
-    """파일 정보 조회"""
-    if not os.path.exists(filepath):
-        return {}
+def get_file_info(filepath: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """파일 정보 조회 (이미 구한 stat_result가 있으면 다시 stat하지 않음)"""
+    stat = stat_result
+    if stat is None:
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return {}
     
-    stat = os.stat(filepath)
     return {
         'size': stat.st_size,
         'size_formatted': format_file_size(stat.st_size),
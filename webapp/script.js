@@ -82,6 +82,8 @@ async function loadJSONFile() {
     questionsData = await response.json();
 
     if (Array.isArray(questionsData) && questionsData.length > 0) {
+      await loadBinaryImages(questionsData);
+
       console.log("JSON 파일 로드 완료:", questionsData.length + "개 문제");
 
       // 이미지가 있는 문제 확인
@@ -117,6 +119,43 @@ async function loadJSONFile() {
   }
 }
 
+// 바이너리 사이드카(cka_qa_images.bin)에 저장된 이미지를 Blob URL로 변환
+async function loadBinaryImages(questions) {
+  const buffers = {};
+
+  for (const question of questions) {
+    for (const imageData of question.images || []) {
+      if (!imageData.bin) continue;
+
+      if (!buffers[imageData.bin]) {
+        const response = await fetch(`./${imageData.bin}`);
+        if (!response.ok) {
+          throw new Error(
+            `${imageData.bin} 로드 실패 (HTTP ${response.status})`
+          );
+        }
+        buffers[imageData.bin] = await response.arrayBuffer();
+      }
+
+      const bytes = buffers[imageData.bin].slice(
+        imageData.offset,
+        imageData.offset + imageData.length
+      );
+      imageData.url = URL.createObjectURL(
+        new Blob([bytes], { type: imageData.mime })
+      );
+    }
+  }
+}
+
+// 이미지 데이터의 표시용 주소 (사이드카 Blob URL 또는 base64 data URL)
+function getImageSrc(imageData) {
+  if (imageData.url) {
+    return imageData.url;
+  }
+  return `data:image/${imageData.format || "png"};base64,${imageData.base64}`;
+}
+
 // 앱 초기화
 function initializeApp() {
   // 문제 번호 순으로 정렬
@@ -229,9 +268,7 @@ function displayQuestionImages(question) {
 
     const img = document.createElement("img");
     img.className = "question-image";
-    img.src = `data:image/${imageData.format || "png"};base64,${
-      imageData.base64
-    }`;
+    img.src = getImageSrc(imageData);
     img.alt = `문제 ${question.question_no} - Question 이미지 ${index + 1}`;
 
     // 이미지 클릭 시 모달로 확대
@@ -274,9 +311,7 @@ function displayAnswerImages(question) {
 
     const img = document.createElement("img");
     img.className = "answer-image";
-    img.src = `data:image/${imageData.format || "png"};base64,${
-      imageData.base64
-    }`;
+    img.src = getImageSrc(imageData);
     img.alt = `문제 ${question.question_no} - Answer 이미지 ${index + 1}`;
 
     // 이미지 클릭 시 모달로 확대